@@ -1,64 +1,193 @@
 """The AquaLevel integration."""
-import asyncio
 import logging
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import discovery
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-import aiohttp
 
-from .const import DOMAIN
+from .const import (
+    CONF_PLATFORMS,
+    CONF_PUMP_CONTROLLERS,
+    CONF_SENSORS,
+    CONF_TOPIC,
+    CONF_TRANSPORT,
+    DATA_FLEET,
+    DATA_PUMP_CONFIG,
+    DOMAIN,
+    MANUFACTURER,
+    MODEL,
+    TRANSPORT_MQTT,
+)
+from .alerts import ALERT_HIGH, ALERT_LOW
+from .coordinator import AquaLevelDataUpdateCoordinator
+from .fleet import AquaLevelFleet
+from .pump import PUMP_CONTROLLER_SCHEMA, PumpController
+from .service import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
-# Only use the sensor platform initially to validate connection
-PLATFORMS = ["sensor"]
+PLATFORMS = ["sensor", "binary_sensor", "number", "switch", "button"]
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(CONF_PUMP_CONTROLLERS, default=[]): vol.All(
+                    cv.ensure_list, [PUMP_CONTROLLER_SCHEMA]
+                ),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
 
 async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the AquaLevel component."""
     hass.data.setdefault(DOMAIN, {})
+    hass.data[DATA_FLEET] = AquaLevelFleet()
+    hass.data[DATA_PUMP_CONFIG] = config.get(DOMAIN, {}).get(CONF_PUMP_CONTROLLERS, [])
+    await async_setup_services(hass)
+
+    # Fleet aggregate sensors belong to the integration, not to any one entry
+    hass.async_create_task(
+        discovery.async_load_platform(hass, "sensor", DOMAIN, {}, config)
+    )
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up AquaLevel from a config entry."""
-    host = entry.data["host"]
-    
-    # Create a simple session for testing connection
-    session = async_get_clientsession(hass)
-    
-    # Test connection to device
-    try:
-        async with session.get(f"http://{host}/tank-data", timeout=10) as resp:
-            _LOGGER.debug(f"Connection test to {host}/tank-data: status={resp.status}")
-    except Exception as err:
-        _LOGGER.error(f"Connection test failed: {err}")
-    
-    # Store entry data
-    hass.data[DOMAIN][entry.entry_id] = {
-        "host": host,
-        "session": session
-    }
-
-    # Only set up the sensor platform initially
-    for platform in PLATFORMS:
-        hass.async_create_task(
-            hass.config_entries.async_forward_entry_setup(entry, platform)
+    if entry.data.get(CONF_TRANSPORT) == TRANSPORT_MQTT:
+        # Imported here so HTTP-only setups don't need the MQTT integration
+        from .mqtt_coordinator import AquaLevelMqttCoordinator
+
+        host = entry.data[CONF_TOPIC]
+        coordinator = AquaLevelMqttCoordinator(hass, host, entry.title, dict(entry.options))
+        await coordinator.async_start()
+        entry.async_on_unload(coordinator.async_stop)
+    else:
+        host = entry.data[CONF_HOST]
+        session = async_get_clientsession(hass)
+        coordinator = AquaLevelDataUpdateCoordinator(
+            hass, session, host, entry.title, dict(entry.options)
         )
 
+    await coordinator.async_config_entry_first_refresh()
+
+    # Multi-tank controllers get a parent device that each tank hangs off
+    if coordinator.is_multi_tank:
+        dr.async_get(hass).async_get_or_create(
+            config_entry_id=entry.entry_id,
+            identifiers={(DOMAIN, host)},
+            name=entry.title,
+            manufacturer=MANUFACTURER,
+            model=MODEL,
+        )
+
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+    fleet = hass.data[DATA_FLEET]
+
+    @callback
+    def _async_push_tanks(tank_ids):
+        """Push the given tanks of this controller into the fleet aggregates."""
+        if not coordinator.last_update_success:
+            return
+        fleet.async_remove_tanks(
+            (host, tank_id) for tank_id in tank_ids if tank_id not in coordinator.tanks
+        )
+        fleet.async_update_tanks(
+            (
+                (host, tank_id),
+                coordinator.tank_name(tank_id),
+                coordinator.tanks[tank_id],
+                coordinator.alerts.is_on(tank_id, ALERT_LOW),
+                coordinator.alerts.is_on(tank_id, ALERT_HIGH),
+            )
+            for tank_id in tank_ids if tank_id in coordinator.tanks
+        )
+
+    @callback
+    def _async_update_fleet():
+        """Push tanks with new readings, changed alerts or a running consumption rate."""
+        tank_ids = set(coordinator.changed_tanks)
+        tank_ids.update(tank_id for tank_id, _key in coordinator.alerts.changed)
+        tank_ids.update(
+            tank_id for tank_id in coordinator.tanks if fleet.is_consuming((host, tank_id))
+        )
+        _async_push_tanks(tank_ids)
+
+    @callback
+    def _async_update_fleet_alerts():
+        """Push tanks whose alerts changed between updates."""
+        _async_push_tanks({tank_id for tank_id, _key in coordinator.alerts.changed})
+
+    _async_push_tanks(set(coordinator.tanks))
+    entry.async_on_unload(coordinator.async_add_listener(_async_update_fleet))
+    entry.async_on_unload(coordinator.alerts.async_add_listener(_async_update_fleet_alerts))
+    entry.async_on_unload(coordinator.alerts.async_stop)
+
+    # Pump controllers act in the update callback, on the tick a reading arrives
+    for pump_config in hass.data.get(DATA_PUMP_CONFIG, []):
+        if pump_config[CONF_HOST] != host:
+            continue
+        controller = PumpController(hass, coordinator, pump_config)
+        controller.async_handle_update()
+        entry.async_on_unload(coordinator.async_add_listener(controller.async_handle_update))
+        entry.async_on_unload(controller.async_shutdown)
+
+    coordinator.platforms = enabled_platforms(entry.options)
+    await hass.config_entries.async_forward_entry_setups(entry, coordinator.platforms)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
     return True
 
+def enabled_platforms(options: dict) -> list:
+    """Return the entity platforms enabled in the entry options."""
+    enabled = options.get(CONF_PLATFORMS, PLATFORMS)
+    return [platform for platform in PLATFORMS if platform in enabled]
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry):
+    """Apply changed options to the running entry without reloading it."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    previous = coordinator.options
+    coordinator.async_apply_options(dict(entry.options))
+
+    current = enabled_platforms(entry.options)
+    removed = [platform for platform in coordinator.platforms if platform not in current]
+    added = [platform for platform in current if platform not in coordinator.platforms]
+
+    # Changing the sensor selection only needs the sensor platform re-added
+    if (
+        "sensor" in current
+        and "sensor" in coordinator.platforms
+        and previous.get(CONF_SENSORS) != entry.options.get(CONF_SENSORS)
+    ):
+        removed.append("sensor")
+        added.append("sensor")
+
+    if removed:
+        await hass.config_entries.async_unload_platforms(entry, removed)
+    if added:
+        await hass.config_entries.async_forward_entry_setups(entry, added)
+    coordinator.platforms = current
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
-    unload_ok = all(
-        await asyncio.gather(
-            *[
-                hass.config_entries.async_forward_entry_unload(entry, platform)
-                for platform in PLATFORMS
-            ]
-        )
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, coordinator.platforms
     )
-    
+
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
-        
+        hass.data[DATA_FLEET].async_remove_tanks(
+            (coordinator.host, tank_id) for tank_id in coordinator.tanks
+        )
+
     return unload_ok
@@ -0,0 +1,293 @@
+"""Alert evaluation for AquaLevel tanks, run once per coordinator update."""
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    CONF_ALERT_DWELL,
+    CONF_ALERT_HYSTERESIS,
+    CONF_DROP_RATE,
+    CONF_DROP_RATE_HYSTERESIS,
+    DEFAULT_ALERT_DWELL,
+    DEFAULT_ALERT_HYSTERESIS,
+    DEFAULT_DROP_RATE,
+    DEFAULT_DROP_RATE_HYSTERESIS,
+    RATE_WINDOW,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ALERT_LOW = "low_water_alert"
+ALERT_HIGH = "high_water_alert"
+ALERT_DROP = "rapid_drop_alert"
+
+# Options that change how alerts are evaluated
+ALERT_OPTIONS = (
+    CONF_ALERT_HYSTERESIS,
+    CONF_ALERT_DWELL,
+    CONF_DROP_RATE,
+    CONF_DROP_RATE_HYSTERESIS,
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class AlertDefinition:
+    """Describes how one alert is derived from a tank's readings.
+
+    ``value_fn`` gets the tank data and its level change rate in percentage
+    points per hour; ``threshold_fn`` gets the tank data and the entry
+    options. Either returning None makes the alert unavailable. The alert
+    triggers at or above the threshold if ``above`` is set, else at or below,
+    and clears once the value is the ``band_option`` hysteresis, in the
+    value's own unit, back on the other side.
+    """
+
+    key: str
+    above: bool
+    value_fn: Callable[[dict, float], float | None]
+    threshold_fn: Callable[[dict, dict], float | None]
+    band_option: str = CONF_ALERT_HYSTERESIS
+    default_band: float = DEFAULT_ALERT_HYSTERESIS
+
+
+ALERT_DEFINITIONS = (
+    AlertDefinition(
+        key=ALERT_LOW,
+        above=False,
+        value_fn=lambda data, rate: data.get("percentage"),
+        threshold_fn=lambda data, options: data.get("alertLevelLow"),
+    ),
+    AlertDefinition(
+        key=ALERT_HIGH,
+        above=True,
+        value_fn=lambda data, rate: data.get("percentage"),
+        threshold_fn=lambda data, options: data.get("alertLevelHigh"),
+    ),
+    AlertDefinition(
+        key=ALERT_DROP,
+        above=True,
+        value_fn=lambda data, rate: -rate if "percentage" in data else None,
+        threshold_fn=lambda data, options: options.get(CONF_DROP_RATE, DEFAULT_DROP_RATE),
+        band_option=CONF_DROP_RATE_HYSTERESIS,
+        default_band=DEFAULT_DROP_RATE_HYSTERESIS,
+    ),
+)
+
+
+@dataclass(slots=True)
+class AlertState:
+    """The cached state of one alert of one tank."""
+
+    available: bool = False
+    is_on: bool = False
+    pending_since: float | None = None
+
+
+@dataclass(slots=True)
+class LevelRate:
+    """Level change rate of a tank, measured over RATE_WINDOW."""
+
+    baseline: float
+    baseline_time: float
+    rate: float = 0.0
+
+
+class AlertEngine:
+    """Evaluate the alerts of every tank of one controller.
+
+    An alert switches on when its condition holds and only clears once the
+    value is its hysteresis band back on the safe side. With
+    ``alert_dwell`` set, either transition must hold that many seconds
+    before it is applied; a timer applies it if no reading arrives meanwhile.
+    Entities read the cached result and check ``changed`` to decide whether
+    to write their state.
+    """
+
+    def __init__(self, coordinator):
+        """Initialize the engine for ``coordinator``."""
+        self.coordinator = coordinator
+        self.changed = set()
+        self._states = {}
+        self._rates = {}
+        self._listeners = []
+        self._cancel_timer = None
+
+    def get(self, tank_id: str, key: str) -> AlertState | None:
+        """Return the cached state of an alert."""
+        return self._states.get((tank_id, key))
+
+    def is_on(self, tank_id: str, key: str) -> bool:
+        """Return True if an alert is available and on."""
+        state = self._states.get((tank_id, key))
+        return state is not None and state.available and state.is_on
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for alerts changed between updates; returns an unsubscribe function."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel a pending dwell timer."""
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+
+    @callback
+    def async_reevaluate(self) -> None:
+        """Re-evaluate every tank, e.g. after the alert options changed."""
+        self._async_evaluate_and_notify(set(self.coordinator.tanks))
+
+    @callback
+    def async_evaluate(self) -> None:
+        """Re-evaluate after a coordinator update.
+
+        Only tanks that changed, have a pending transition or a non-zero
+        rate are evaluated.
+        """
+        self.changed = set()
+        coordinator = self.coordinator
+        if not coordinator.last_update_success:
+            return
+
+        tank_ids = set(coordinator.changed_tanks)
+        tank_ids.update(
+            tank_id for (tank_id, _), state in self._states.items()
+            if state.pending_since is not None
+        )
+        tank_ids.update(
+            tank_id for tank_id, rate in self._rates.items() if rate.rate
+        )
+        self._async_evaluate_tanks(tank_ids, time.monotonic())
+
+    @callback
+    def _async_evaluate_tanks(self, tank_ids, now: float) -> None:
+        """Evaluate the alerts of ``tank_ids`` and reschedule the dwell timer."""
+        coordinator = self.coordinator
+        options = coordinator.options
+        dwell = options.get(CONF_ALERT_DWELL, DEFAULT_ALERT_DWELL)
+
+        for tank_id in tank_ids:
+            data = coordinator.tanks.get(tank_id)
+            if data is None:
+                self._async_remove_tank(tank_id)
+                continue
+
+            rate = self._update_rate(tank_id, data, now)
+            enabled = data.get("alertsEnabled", True)
+            for definition in ALERT_DEFINITIONS:
+                key = (tank_id, definition.key)
+                state = self._states.get(key)
+                value = definition.value_fn(data, rate)
+                threshold = definition.threshold_fn(data, options)
+                available = value is not None and threshold is not None
+
+                if state is None:
+                    # First reading: take the condition as it is, no dwell
+                    state = self._states[key] = AlertState()
+                    state.available = available
+                    state.is_on = available and enabled and _triggered(definition, value, threshold)
+                    self.changed.add(key)
+                    continue
+
+                if available != state.available:
+                    state.available = available
+                    self.changed.add(key)
+                if not available or not enabled:
+                    target = False
+                elif state.is_on:
+                    band = options.get(definition.band_option, definition.default_band)
+                    target = not _cleared(definition, value, threshold, band)
+                else:
+                    target = _triggered(definition, value, threshold)
+
+                if target == state.is_on or not (available and enabled):
+                    # Missing readings and disabling alerts clear them right away
+                    if target != state.is_on:
+                        state.is_on = target
+                        self.changed.add(key)
+                    state.pending_since = None
+                    continue
+                if state.pending_since is None:
+                    state.pending_since = now
+                if now - state.pending_since >= dwell:
+                    state.is_on = target
+                    state.pending_since = None
+                    self.changed.add(key)
+
+        self._async_schedule_timer(dwell, now)
+
+    def _update_rate(self, tank_id: str, data: dict, now: float) -> float:
+        """Return the tank's level change rate, updating it once per window."""
+        level = data.get("percentage")
+        rate = self._rates.get(tank_id)
+        if level is None:
+            self._rates.pop(tank_id, None)
+            return 0.0
+        if rate is None:
+            self._rates[tank_id] = LevelRate(level, now)
+            return 0.0
+        elapsed = now - rate.baseline_time
+        if elapsed >= RATE_WINDOW:
+            rate.rate = (level - rate.baseline) * 3600 / elapsed
+            rate.baseline, rate.baseline_time = level, now
+        return rate.rate
+
+    @callback
+    def _async_remove_tank(self, tank_id: str) -> None:
+        """Forget the alerts of a tank the controller no longer reports."""
+        self._rates.pop(tank_id, None)
+        for definition in ALERT_DEFINITIONS:
+            if self._states.pop((tank_id, definition.key), None) is not None:
+                self.changed.add((tank_id, definition.key))
+
+    @callback
+    def _async_schedule_timer(self, dwell: float, now: float) -> None:
+        """Wake up when the earliest pending transition is due."""
+        self.async_stop()
+        pending = [
+            state.pending_since for state in self._states.values()
+            if state.pending_since is not None
+        ]
+        if pending:
+            delay = max(min(pending) + dwell - now, 0)
+            self._cancel_timer = async_call_later(
+                self.coordinator.hass, delay, self._async_dwell_elapsed
+            )
+
+    @callback
+    def _async_dwell_elapsed(self, _now) -> None:
+        """Apply transitions whose dwell time passed without a new reading."""
+        self._cancel_timer = None
+        self._async_evaluate_and_notify(
+            {
+                tank_id for (tank_id, _), state in self._states.items()
+                if state.pending_since is not None
+            }
+        )
+
+    @callback
+    def _async_evaluate_and_notify(self, tank_ids: set) -> None:
+        """Evaluate outside a coordinator update and notify listeners of changes."""
+        self.changed = set()
+        if not self.coordinator.last_update_success:
+            return
+        self._async_evaluate_tanks(tank_ids, time.monotonic())
+        if self.changed:
+            for update_callback in list(self._listeners):
+                update_callback()
+
+
+def _triggered(definition: AlertDefinition, value: float, threshold: float) -> bool:
+    """Return True if ``value`` sets off the alert."""
+    return value >= threshold if definition.above else value <= threshold
+
+
+def _cleared(definition: AlertDefinition, value: float, threshold: float, band: float) -> bool:
+    """Return True if ``value`` is far enough back to clear the alert."""
+    return value < threshold - band if definition.above else value > threshold + band
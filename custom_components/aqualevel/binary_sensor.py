@@ -1,136 +1,100 @@
 """AquaLevel binary sensor platform."""
 import logging
+from dataclasses import dataclass
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
+    BinarySensorEntityDescription,
 )
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.entity import DeviceInfo
 
+from .alerts import ALERT_DROP, ALERT_HIGH, ALERT_LOW
 from .const import DOMAIN
+from .entity import AquaLevelEntity, async_add_tank_entities
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class AquaLevelAlertEntityDescription(BinarySensorEntityDescription):
+    """Describes an AquaLevel alert binary sensor.
+
+    The alert itself is evaluated by the coordinator's AlertEngine under the
+    same key.
+    """
+
+    value_key: str = "percentage"
+
+
+ALERT_DESCRIPTIONS = (
+    AquaLevelAlertEntityDescription(
+        key=ALERT_LOW,
+        name="Low Water Alert",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        icon="mdi:water-alert",
+    ),
+    AquaLevelAlertEntityDescription(
+        key=ALERT_HIGH,
+        name="High Water Alert",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        icon="mdi:water-alert",
+    ),
+    AquaLevelAlertEntityDescription(
+        key=ALERT_DROP,
+        name="Rapid Drop Alert",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        icon="mdi:water-minus",
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ):
     """Set up AquaLevel binary sensor entities from a config entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    
-    entities = [
-        AquaLevelLowWaterAlert(coordinator),
-        AquaLevelHighWaterAlert(coordinator),
-    ]
-    
-    async_add_entities(entities)
-
-
-class AquaLevelAlertBinarySensor(CoordinatorEntity, BinarySensorEntity):
-    """Base class for AquaLevel alert binary sensors."""
-
-    _attr_has_entity_name = True
-    _attr_device_class = BinarySensorDeviceClass.PROBLEM
-
-    def __init__(
-        self, 
-        coordinator,
-        name_suffix: str,
-        key: str,
-        icon: str = None,
-    ):
-        """Initialize the binary sensor entity."""
-        super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.host}_{key}"
-        self._attr_name = name_suffix
-        self._key = key
-        if icon:
-            self._attr_icon = icon
-            
-        # Device info for device registry
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.host)},
-            name=coordinator.name,
-            manufacturer="TechPosts Media",
-            model="AquaLevel Water Tank Monitor",
-            sw_version="1.0",
-        )
 
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        if not self.coordinator.data:
-            return False
-            
-        # Check for required data to determine alert state
-        required_keys = ["percentage"]
-        if not all(key in self.coordinator.data for key in required_keys):
-            return False
-            
-        # Check alert threshold values are available
-        if self._key == "low_water_alert" and "alertLevelLow" not in self.coordinator.data:
-            return False
-        if self._key == "high_water_alert" and "alertLevelHigh" not in self.coordinator.data:
-            return False
-            
-        return True
+    async_add_tank_entities(
+        entry, coordinator, ALERT_DESCRIPTIONS, AquaLevelAlertBinarySensor, async_add_entities
+    )
+
 
+class AquaLevelAlertBinarySensor(AquaLevelEntity, BinarySensorEntity):
+    """Binary sensor showing an alert cached by the coordinator's AlertEngine."""
 
-class AquaLevelLowWaterAlert(AquaLevelAlertBinarySensor):
-    """Binary sensor for low water level alert."""
+    entity_description: AquaLevelAlertEntityDescription
 
-    def __init__(self, coordinator):
-        """Initialize the entity."""
-        super().__init__(
-            coordinator=coordinator,
-            name_suffix="Low Water Alert",
-            key="low_water_alert",
-            icon="mdi:water-alert",
+    async def async_added_to_hass(self) -> None:
+        """Also follow alerts switched by a dwell timer between updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.alerts.async_add_listener(self._handle_coordinator_update)
         )
 
     @property
-    def is_on(self) -> bool:
-        """Return true if the water level is below the low alert threshold."""
-        if not self.coordinator.data:
-            return False
-            
-        # Only show alert if alerts are enabled
-        if not self.coordinator.data.get("alertsEnabled", True):
+    def available(self) -> bool:
+        """Return if entity is available."""
+        if not super().available:
             return False
-            
-        percentage = self.coordinator.data.get("percentage", 0)
-        low_threshold = self.coordinator.data.get("alertLevelLow", 10)
-        
-        return percentage <= low_threshold
-
-
-class AquaLevelHighWaterAlert(AquaLevelAlertBinarySensor):
-    """Binary sensor for high water level alert."""
-
-    def __init__(self, coordinator):
-        """Initialize the entity."""
-        super().__init__(
-            coordinator=coordinator,
-            name_suffix="High Water Alert",
-            key="high_water_alert",
-            icon="mdi:water-alert",
-        )
+        state = self.coordinator.alerts.get(self._tank_id, self.entity_description.key)
+        return state is not None and state.available
 
     @property
     def is_on(self) -> bool:
-        """Return true if the water level is above the high alert threshold."""
-        if not self.coordinator.data:
-            return False
-            
-        # Only show alert if alerts are enabled
-        if not self.coordinator.data.get("alertsEnabled", True):
-            return False
-            
-        percentage = self.coordinator.data.get("percentage", 0)
-        high_threshold = self.coordinator.data.get("alertLevelHigh", 90)
-        
-        return percentage >= high_threshold
+        """Return true if the alert is active."""
+        return self.coordinator.alerts.is_on(self._tank_id, self.entity_description.key)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if this alert changed or availability flipped."""
+        success = self.coordinator.last_update_success
+        if (
+            success == self._last_update_success
+            and (self._tank_id, self.entity_description.key) not in self.coordinator.alerts.changed
+        ):
+            return
+        self._last_update_success = success
+        self.async_write_ha_state()
@@ -0,0 +1,72 @@
+"""Statistical acceptance of AquaLevel calibration samples."""
+from dataclasses import dataclass
+from statistics import mean, median, pstdev
+
+# Modified z-score above which a sample is treated as an outlier
+OUTLIER_Z_SCORE = 3.5
+# Fraction of samples that must survive outlier rejection
+MIN_ACCEPTED_RATIO = 0.5
+MIN_ACCEPTED_SAMPLES = 3
+# Distance resolution of the sensor; the smallest spread the MAD is taken as,
+# so readings one step off a constant median aren't rejected as outliers
+SENSOR_RESOLUTION = 0.1  # cm
+
+
+@dataclass(frozen=True)
+class CalibrationResult:
+    """Outcome of evaluating a set of distance samples."""
+
+    accepted: bool
+    value: float | None
+    deviation: float | None
+    samples: int
+    used: int
+    reason: str | None = None
+
+
+def reject_outliers(samples: list) -> list:
+    """Drop samples whose modified z-score (median absolute deviation) is too high."""
+    if len(samples) < 3:
+        return list(samples)
+    center = median(samples)
+    mad = max(median(abs(sample - center) for sample in samples), SENSOR_RESOLUTION)
+    return [
+        sample for sample in samples
+        if 0.6745 * abs(sample - center) / mad <= OUTLIER_Z_SCORE
+    ]
+
+
+def evaluate_samples(samples: list, max_deviation: float) -> CalibrationResult:
+    """Reject outliers and accept the mean if the rest are tight enough."""
+    used = reject_outliers(samples)
+    needed = max(MIN_ACCEPTED_SAMPLES, int(len(samples) * MIN_ACCEPTED_RATIO))
+
+    if len(used) < needed:
+        return CalibrationResult(
+            accepted=False,
+            value=None,
+            deviation=None,
+            samples=len(samples),
+            used=len(used),
+            reason=f"only {len(used)} of {len(samples)} samples usable, {needed} needed",
+        )
+
+    value = mean(used)
+    deviation = pstdev(used)
+    if deviation > max_deviation:
+        return CalibrationResult(
+            accepted=False,
+            value=value,
+            deviation=deviation,
+            samples=len(samples),
+            used=len(used),
+            reason=f"readings spread {deviation:.2f} cm, limit is {max_deviation} cm",
+        )
+
+    return CalibrationResult(
+        accepted=True,
+        value=value,
+        deviation=deviation,
+        samples=len(samples),
+        used=len(used),
+    )
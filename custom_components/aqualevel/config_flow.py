@@ -1,13 +1,51 @@
 """Config flow for AquaLevel integration."""
+import asyncio
 import logging
 import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_NAME
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN
+from .const import (
+    CONF_ALERT_DWELL,
+    CONF_ALERT_HYSTERESIS,
+    CONF_CONCURRENCY,
+    CONF_DELTA_MODE,
+    CONF_DROP_RATE,
+    CONF_DROP_RATE_HYSTERESIS,
+    CONF_PLATFORMS,
+    CONF_SCAN_INTERVAL,
+    CONF_SENSORS,
+    CONF_TIMEOUT,
+    CONF_TOPIC,
+    CONF_TRANSPORT,
+    DEFAULT_ALERT_DWELL,
+    DEFAULT_ALERT_HYSTERESIS,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_DROP_RATE,
+    DEFAULT_DROP_RATE_HYSTERESIS,
+    DEFAULT_NAME,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TIMEOUT,
+    DOMAIN,
+    TRANSPORT_HTTP,
+    TRANSPORT_MQTT,
+)
+from .sensor import SENSOR_DESCRIPTIONS
+
+PLATFORM_OPTIONS = {
+    "sensor": "Sensors",
+    "binary_sensor": "Alert binary sensors",
+    "number": "Tank settings",
+    "switch": "Switches",
+    "button": "Calibration buttons",
+}
+
+SENSOR_OPTIONS = {description.key: description.name for description in SENSOR_DESCRIPTIONS}
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,12 +54,55 @@ CONFIG_SCHEMA = vol.Schema({
     vol.Optional(CONF_NAME, default="AquaLevel"): str,
 })
 
+MQTT_SCHEMA = vol.Schema({
+    vol.Required(CONF_TOPIC): str,
+    vol.Optional(CONF_NAME, default="AquaLevel"): str,
+})
+
 class AquaLevelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for AquaLevel."""
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow for this handler."""
+        return AquaLevelOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
-        """Handle the initial step."""
+        """Handle the initial step: pick how the device is reached."""
+        return self.async_show_menu(
+            step_id="user",
+            menu_options=[TRANSPORT_HTTP, TRANSPORT_MQTT],
+        )
+
+    async def async_step_mqtt(self, user_input=None):
+        """Set up a device that reports over MQTT."""
+        errors = {}
+        
+        if "mqtt" not in self.hass.config.components:
+            return self.async_abort(reason="mqtt_not_configured")
+        
+        if user_input is not None:
+            topic = user_input[CONF_TOPIC].strip("/")
+            if not topic or "#" in topic or "+" in topic:
+                errors[CONF_TOPIC] = "invalid_topic"
+            else:
+                await self.async_set_unique_id(topic)
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(
+                    title=user_input.get(CONF_NAME, DEFAULT_NAME),
+                    data={**user_input, CONF_TRANSPORT: TRANSPORT_MQTT, CONF_TOPIC: topic},
+                )
+        
+        return self.async_show_form(
+            step_id="mqtt",
+            data_schema=MQTT_SCHEMA,
+            errors=errors,
+        )
+
+    async def async_step_http(self, user_input=None):
+        """Set up a device polled over HTTP."""
         errors = {}
         
         if user_input is not None:
@@ -66,7 +147,66 @@ class AquaLevelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         
         # Show form
         return self.async_show_form(
-            step_id="user", 
+            step_id="http", 
             data_schema=CONFIG_SCHEMA,
             errors=errors,
         )
+
+
+class AquaLevelOptionsFlow(config_entries.OptionsFlow):
+    """Handle AquaLevel options; changes apply without reloading the entry."""
+
+    def __init__(self, config_entry):
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage polling and entity options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        schema = vol.Schema({
+            vol.Optional(
+                CONF_SCAN_INTERVAL,
+                default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+            vol.Optional(
+                CONF_TIMEOUT,
+                default=options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+            vol.Optional(
+                CONF_CONCURRENCY,
+                default=options.get(CONF_CONCURRENCY, DEFAULT_CONCURRENCY),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+            vol.Optional(
+                CONF_DELTA_MODE,
+                default=options.get(CONF_DELTA_MODE, False),
+            ): bool,
+            vol.Optional(
+                CONF_ALERT_HYSTERESIS,
+                default=options.get(CONF_ALERT_HYSTERESIS, DEFAULT_ALERT_HYSTERESIS),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=50)),
+            vol.Optional(
+                CONF_ALERT_DWELL,
+                default=options.get(CONF_ALERT_DWELL, DEFAULT_ALERT_DWELL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+            vol.Optional(
+                CONF_DROP_RATE,
+                default=options.get(CONF_DROP_RATE, DEFAULT_DROP_RATE),
+            ): vol.All(vol.Coerce(float), vol.Range(min=1, max=1000)),
+            vol.Optional(
+                CONF_DROP_RATE_HYSTERESIS,
+                default=options.get(CONF_DROP_RATE_HYSTERESIS, DEFAULT_DROP_RATE_HYSTERESIS),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1000)),
+            vol.Optional(
+                CONF_PLATFORMS,
+                default=options.get(CONF_PLATFORMS, list(PLATFORM_OPTIONS)),
+            ): cv.multi_select(PLATFORM_OPTIONS),
+            vol.Optional(
+                CONF_SENSORS,
+                default=options.get(CONF_SENSORS, list(SENSOR_OPTIONS)),
+            ): cv.multi_select(SENSOR_OPTIONS),
+        })
+
+        return self.async_show_form(step_id="init", data_schema=schema)
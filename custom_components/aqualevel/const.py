@@ -1,2 +1,120 @@
 """Constants for the AquaLevel integration."""
 DOMAIN = "aqualevel"
+
+MANUFACTURER = "TechPosts Media"
+MODEL = "AquaLevel Water Tank Monitor"
+
+DEFAULT_NAME = "AquaLevel"
+
+# Transports
+CONF_TRANSPORT = "transport"
+CONF_TOPIC = "topic"
+TRANSPORT_HTTP = "http"
+TRANSPORT_MQTT = "mqtt"
+TOPIC_TANK_DATA = "tank-data"
+TOPIC_SETTINGS = "settings"
+DEFAULT_SCAN_INTERVAL = 30  # seconds
+DEFAULT_TIMEOUT = 10  # seconds
+DEFAULT_CONCURRENCY = 2  # simultaneous requests per controller
+
+# Options
+CONF_SCAN_INTERVAL = "scan_interval"
+CONF_TIMEOUT = "timeout"
+CONF_CONCURRENCY = "concurrency"
+CONF_DELTA_MODE = "delta_mode"
+CONF_PLATFORMS = "platforms"
+CONF_SENSORS = "sensors"
+CONF_ALERT_HYSTERESIS = "alert_hysteresis"
+CONF_ALERT_DWELL = "alert_dwell"
+CONF_DROP_RATE = "drop_rate"
+CONF_DROP_RATE_HYSTERESIS = "drop_rate_hysteresis"
+
+# Alerts: clear band, time a condition must hold, rapid-drop threshold and its band
+DEFAULT_ALERT_HYSTERESIS = 2.0  # percentage points
+DEFAULT_ALERT_DWELL = 0  # seconds
+DEFAULT_DROP_RATE = 20.0  # percentage points per hour
+DEFAULT_DROP_RATE_HYSTERESIS = 5.0  # percentage points per hour
+RATE_WINDOW = 300  # seconds a level change rate is measured over
+
+# hass.data key for the fleet aggregates shared by all config entries
+DATA_FLEET = f"{DOMAIN}_fleet"
+
+# Controllers measuring several tanks report them as a list under this key
+ATTR_TANKS = "tanks"
+# Delta protocol: sequence number, delta marker and removed tank ids
+ATTR_SEQ = "seq"
+ATTR_DELTA = "delta"
+ATTR_REMOVED = "removed"
+# Pause between long-polls while the device supports them
+LONG_POLL_GAP = 0.5  # seconds
+# Tank id used for controllers that report a single tank at the top level
+DEFAULT_TANK_ID = ""
+
+# Services
+SERVICE_CALIBRATE = "calibrate"
+SERVICE_UPDATE_SETTINGS = "update_settings"
+SERVICE_EXPORT_HISTORY = "export_history"
+SERVICE_PROFILE = "profile"
+SERVICE_RECORD_TRACE = "record_trace"
+
+ATTR_ENTITY_ID = "entity_id"
+ATTR_CALIBRATION_TYPE = "calibration_type"
+ATTR_SAMPLES = "samples"
+ATTR_MAX_DEVIATION = "max_deviation"
+ATTR_TANK_HEIGHT = "tank_height"
+ATTR_TANK_DIAMETER = "tank_diameter"
+ATTR_TANK_VOLUME = "tank_volume"
+ATTR_SENSOR_OFFSET = "sensor_offset"
+ATTR_EMPTY_DISTANCE = "empty_distance"
+ATTR_FULL_DISTANCE = "full_distance"
+ATTR_MEASUREMENT_INTERVAL = "measurement_interval"
+ATTR_READING_SMOOTHING = "reading_smoothing"
+ATTR_ALERT_LEVEL_LOW = "alert_level_low"
+ATTR_ALERT_LEVEL_HIGH = "alert_level_high"
+ATTR_ALERTS_ENABLED = "alerts_enabled"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_FORMAT = "format"
+ATTR_SOURCE = "source"
+ATTR_FILENAME = "filename"
+ATTR_DURATION = "duration"
+ATTR_MEMORY = "memory"
+
+# Calibration
+CALIBRATION_EMPTY = "empty"
+CALIBRATION_FULL = "full"
+DEFAULT_CALIBRATION_SAMPLES = 10
+DEFAULT_CALIBRATION_MAX_DEVIATION = 1.0  # cm
+MIN_SAMPLE_INTERVAL = 0.2  # seconds
+EVENT_CALIBRATION_PROGRESS = f"{DOMAIN}_calibration_progress"
+
+# History export
+EXPORT_DIRECTORY = "aqualevel_exports"
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_PARQUET = "parquet"
+EXPORT_SOURCE_STATES = "states"
+EXPORT_SOURCE_STATISTICS = "statistics"
+
+# Profiling
+DATA_PROFILE = f"{DOMAIN}_profile"
+PROFILE_DIRECTORY = "aqualevel_profiles"
+EVENT_PROFILE_COMPLETE = f"{DOMAIN}_profile_complete"
+
+# Traffic traces
+DATA_TRACE = f"{DOMAIN}_trace"
+TRACE_DIRECTORY = "aqualevel_traces"
+TRACE_VERSION = 1
+EVENT_TRACE_COMPLETE = f"{DOMAIN}_trace_complete"
+
+# Pump controllers
+CONF_PUMP_CONTROLLERS = "pump_controllers"
+CONF_TANK = "tank"
+CONF_SWITCH = "switch"
+CONF_START_BELOW = "start_below"
+CONF_STOP_ABOVE = "stop_above"
+CONF_MAX_RUNTIME = "max_runtime"
+CONF_DRY_RUN_TIMEOUT = "dry_run_timeout"
+CONF_DRY_RUN_MIN_RISE = "dry_run_min_rise"
+CONF_LOCKOUT = "lockout"
+DATA_PUMP_CONFIG = f"{DOMAIN}_pump_config"
+EVENT_PUMP_CONTROLLER = f"{DOMAIN}_pump_controller"
@@ -0,0 +1,409 @@
+"""Data update coordinator for the AquaLevel integration."""
+import asyncio
+import contextlib
+import logging
+import time
+from datetime import timedelta
+from http import HTTPStatus
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .alerts import ALERT_OPTIONS, AlertEngine
+from .calibration import CalibrationResult, evaluate_samples
+from .profiler import ProfiledCoroutine
+from .const import (
+    ATTR_DELTA,
+    ATTR_REMOVED,
+    ATTR_SEQ,
+    ATTR_TANKS,
+    CALIBRATION_EMPTY,
+    CONF_CONCURRENCY,
+    CONF_DELTA_MODE,
+    CONF_SCAN_INTERVAL,
+    CONF_TIMEOUT,
+    DEFAULT_CALIBRATION_MAX_DEVIATION,
+    DEFAULT_CALIBRATION_SAMPLES,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TANK_ID,
+    DEFAULT_TIMEOUT,
+    DOMAIN,
+    EVENT_CALIBRATION_PROGRESS,
+    LONG_POLL_GAP,
+    MANUFACTURER,
+    MIN_SAMPLE_INTERVAL,
+    MODEL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def split_tanks(payload: dict) -> dict:
+    """Split a /tank-data payload into per-tank dicts keyed by tank id.
+
+    Single-tank controllers report their readings at the top level and map
+    to DEFAULT_TANK_ID. Multi-tank controllers report a list under "tanks";
+    each entry is identified by its "id" field, or its position if missing.
+    """
+    tanks = payload.get(ATTR_TANKS)
+    if not isinstance(tanks, list):
+        return {DEFAULT_TANK_ID: payload}
+
+    result = {}
+    for index, tank in enumerate(tanks):
+        if not isinstance(tank, dict):
+            continue
+        result[str(tank.get("id", index))] = tank
+    return result
+
+
+def merge_delta(payload: dict, tanks: dict, delta: dict) -> tuple:
+    """Merge a delta payload into the controller payload and per-tank dicts.
+
+    ``payload`` is the current full payload. If it lists tanks, top-level
+    fields of the delta are controller-level fields such as "rssi" and are
+    merged into it; otherwise they are the single tank's readings. Returns the
+    new payload, the new tank dicts and the ids of tanks that actually
+    changed. Unchanged tanks keep their existing dict objects.
+    """
+    merged = dict(tanks)
+    updates = {}
+    if isinstance(delta.get(ATTR_TANKS), list):
+        updates = {
+            str(tank["id"]): tank
+            for tank in delta[ATTR_TANKS]
+            if isinstance(tank, dict) and "id" in tank
+        }
+    fields = {
+        key: value for key, value in delta.items()
+        if key not in (ATTR_SEQ, ATTR_DELTA, ATTR_REMOVED, ATTR_TANKS)
+    }
+    if fields and isinstance(payload.get(ATTR_TANKS), list):
+        payload = {**payload, **fields}
+    elif fields:
+        updates[DEFAULT_TANK_ID] = {**updates.get(DEFAULT_TANK_ID, {}), **fields}
+
+    changed = set()
+    for tank_id, fields in updates.items():
+        old = merged.get(tank_id, {})
+        new = {**old, **fields}
+        if new != old:
+            merged[tank_id] = new
+            changed.add(tank_id)
+
+    for tank_id in delta.get(ATTR_REMOVED, []):
+        if merged.pop(str(tank_id), None) is not None:
+            changed.add(str(tank_id))
+
+    return payload, merged, changed
+
+
+def join_tanks(payload: dict, tanks: dict) -> dict:
+    """Rebuild a full payload from per-tank dicts, the inverse of split_tanks."""
+    if DEFAULT_TANK_ID in tanks:
+        return tanks[DEFAULT_TANK_ID]
+    return {**payload, ATTR_TANKS: list(tanks.values())}
+
+
+def _form_value(value) -> str:
+    """Encode a settings value the way the device web server expects."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+class AquaLevelDataUpdateCoordinator(DataUpdateCoordinator):
+    """Poll one AquaLevel controller and track which of its tanks changed."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        host: str,
+        name: str,
+        options: dict | None = None,
+    ):
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=name,
+            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+        )
+        self.host = host
+        self.session = session
+        self.tanks = {}
+        self.changed_tanks = set()
+        self._device_info = {}
+        self.platforms = []
+        self.profiler = None
+        self.trace = None
+        self.options = {}
+        self.timeout = DEFAULT_TIMEOUT
+        self.delta_mode = False
+        self._long_poll = True
+        self._poll_now = False
+        self._seq = None
+        self._concurrency = None
+        self._request_limit = None
+        self.alerts = AlertEngine(self)
+        self.async_apply_options(options or {})
+
+    @property
+    def is_multi_tank(self) -> bool:
+        """Return True if the controller reports a list of tanks."""
+        return bool(self.tanks) and DEFAULT_TANK_ID not in self.tanks
+
+    def tank_name(self, tank_id: str) -> str:
+        """Return the display name for a tank."""
+        if tank_id == DEFAULT_TANK_ID:
+            return self.name
+        tank = self.tanks.get(tank_id) or {}
+        return f"{self.name} {tank.get('name') or f'Tank {tank_id}'}"
+
+    @callback
+    def async_apply_options(self, options: dict) -> None:
+        """Apply polling options to the running coordinator.
+
+        A new poll interval replaces the pending refresh right away, so it
+        counts from now rather than from the next scheduled refresh. Changed
+        alert options re-evaluate the alerts of every tank.
+        """
+        previous, self.options = self.options, options
+        interval = timedelta(seconds=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+        rescheduled = interval != self.update_interval
+        self.update_interval = interval
+        if rescheduled and self._unsub_refresh is not None:
+            self._schedule_refresh()
+        self.timeout = options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
+        self.delta_mode = options.get(CONF_DELTA_MODE, False)
+        self._long_poll = True
+        if not self.delta_mode:
+            self._seq = None
+        concurrency = options.get(CONF_CONCURRENCY, DEFAULT_CONCURRENCY)
+        if concurrency != self._concurrency:
+            # Requests already waiting keep the old limit; new ones use this one
+            self._concurrency = concurrency
+            self._request_limit = asyncio.Semaphore(concurrency)
+        if self.tanks and any(
+            previous.get(option) != options.get(option) for option in ALERT_OPTIONS
+        ):
+            self.alerts.async_reevaluate()
+
+    def device_identifier(self, tank_id: str) -> str:
+        """Return the device registry identifier for a tank."""
+        if tank_id == DEFAULT_TANK_ID:
+            return self.host
+        return f"{self.host}_{tank_id}"
+
+    def device_info(self, tank_id: str) -> DeviceInfo:
+        """Return the DeviceInfo for a tank, shared by all of its entities."""
+        if tank_id not in self._device_info:
+            info = DeviceInfo(
+                identifiers={(DOMAIN, self.device_identifier(tank_id))},
+                name=self.tank_name(tank_id),
+                manufacturer=MANUFACTURER,
+                model=MODEL,
+                sw_version="1.0",
+            )
+            if tank_id != DEFAULT_TANK_ID:
+                info["via_device"] = (DOMAIN, self.host)
+            self._device_info[tank_id] = info
+        return self._device_info[tank_id]
+
+    async def async_fetch_payload(self, params: dict | None = None, wait: int = 0) -> dict | None:
+        """Fetch the raw /tank-data payload without touching coordinator state.
+
+        With ``wait`` set, the device may hold the request open that long and
+        answers 204/304 (returned as None) if nothing changed meanwhile. Such
+        long-polls do not count against the concurrency limit, since an idle
+        held connection puts no load on the device.
+        """
+        url = f"http://{self.host}/tank-data"
+        limit = contextlib.nullcontext() if wait else self._request_limit
+        async with limit:
+            async with self.session.get(
+                url, params=params, timeout=self.timeout + wait
+            ) as resp:
+                if resp.status in (HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED):
+                    return None
+                resp.raise_for_status()
+                payload = await resp.json(content_type=None)
+        if not isinstance(payload, dict):
+            raise ValueError(f"Unexpected payload from {url}: {payload!r}")
+        return payload
+
+    async def _async_refresh(self, *args, **kwargs):
+        """Refresh, under the profiler while a profile session is attached."""
+        if self.profiler is None:
+            return await super()._async_refresh(*args, **kwargs)
+        return await ProfiledCoroutine(super()._async_refresh(*args, **kwargs), self.profiler)
+
+    async def _async_update_data(self):
+        """Fetch the latest payload or delta and update the tank snapshot."""
+        params, wait = None, 0
+        if self.delta_mode and self._seq is not None:
+            params = {"since": self._seq}
+            if self._long_poll and not self._poll_now:
+                wait = int(self.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+                params["wait"] = wait
+        self._poll_now = False
+
+        started = time.monotonic()
+        try:
+            payload = await self.async_fetch_payload(params, wait)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+            # Resync with a full payload, retried at the normal poll interval
+            self._seq = None
+            self._async_schedule_next()
+            raise UpdateFailed(f"Error fetching data from {self.host}: {err}") from err
+
+        if payload is None:
+            if self.trace is not None:
+                self.trace.async_record_report(None)
+            if wait and time.monotonic() - started < wait / 2:
+                # The device answered without holding the request: it takes
+                # deltas but not long-polls, so keep to the poll interval
+                _LOGGER.debug("%s does not hold long-polls, polling instead", self.host)
+                self._long_poll = False
+            self.changed_tanks = set()
+            self._async_schedule_next()
+            return self.data
+
+        payload = self._async_process_payload(payload)
+        self._async_schedule_next()
+        return payload
+
+    @callback
+    def _async_process_payload(self, payload: dict) -> dict:
+        """Apply a full or delta payload to the tank snapshot.
+
+        Returns the merged full payload and records the changed tanks.
+        """
+        if self.trace is not None:
+            self.trace.async_record_report(payload)
+        self._seq = payload.get(ATTR_SEQ)
+        if payload.get(ATTR_DELTA) and self.data is not None:
+            data, self.tanks, self.changed_tanks = merge_delta(self.data, self.tanks, payload)
+            return join_tanks(data, self.tanks)
+
+        tanks = split_tanks(payload)
+        previous = self.tanks
+        self.changed_tanks = {
+            tank_id for tank_id, data in tanks.items() if previous.get(tank_id) != data
+        }
+        self.changed_tanks.update(previous.keys() - tanks.keys())
+        self.tanks = tanks
+        return payload
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Evaluate alerts once for this update, then notify listeners."""
+        self.alerts.async_evaluate()
+        super().async_update_listeners()
+
+    @callback
+    def _async_schedule_next(self) -> None:
+        """Long-poll again right away if the device supports it."""
+        interval = self.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        if self.delta_mode and self._long_poll and self._seq is not None:
+            interval = LONG_POLL_GAP
+        self.update_interval = timedelta(seconds=interval)
+
+    @callback
+    def async_skip_long_poll(self) -> None:
+        """Make the next refresh a plain request rather than a held long-poll.
+
+        Used for refreshes after a settings write, which would otherwise
+        hold the caller for the whole poll interval if the write changed
+        nothing the device reports. Only the scheduled refresh long-polls.
+        """
+        self._poll_now = True
+
+    async def _async_post(self, path: str, data: dict) -> None:
+        """POST form data to the device."""
+        url = f"http://{self.host}{path}"
+        form = {key: _form_value(value) for key, value in data.items()}
+        try:
+            async with self._request_limit:
+                async with self.session.post(url, data=form, timeout=self.timeout) as resp:
+                    resp.raise_for_status()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.error("Error posting to %s: %s", url, err)
+            raise
+
+    async def async_update_settings(self, tank_id: str = DEFAULT_TANK_ID, **settings) -> None:
+        """Write settings to a tank and refresh."""
+        if not settings:
+            return
+        if tank_id != DEFAULT_TANK_ID:
+            settings["tank"] = tank_id
+        _LOGGER.debug("Updating settings on %s: %s", self.host, settings)
+        if self.trace is not None:
+            self.trace.async_record_settings(settings)
+        await self._async_post("/settings", settings)
+        self.async_skip_long_poll()
+        await self.async_request_refresh()
+
+    async def async_read_distance(self, tank_id: str = DEFAULT_TANK_ID) -> float:
+        """Take one raw distance reading for a tank."""
+        payload = await self.async_fetch_payload()
+        tank = split_tanks(payload).get(tank_id)
+        if not tank or tank.get("distance") is None:
+            raise ValueError(f"No distance reading for tank {tank_id!r} on {self.host}")
+        return float(tank["distance"])
+
+    def calibration_interval(self, tank_id: str) -> float:
+        """Return the pause between calibration samples of a tank."""
+        tank = self.tanks.get(tank_id) or {}
+        return max(float(tank.get("measurementInterval", 1)), MIN_SAMPLE_INTERVAL)
+
+    async def async_calibrate(
+        self,
+        calibration_type: str,
+        tank_id: str = DEFAULT_TANK_ID,
+        samples: int = DEFAULT_CALIBRATION_SAMPLES,
+        max_deviation: float = DEFAULT_CALIBRATION_MAX_DEVIATION,
+    ) -> CalibrationResult:
+        """Calibrate a tank from several distance samples and store the result.
+
+        Samples are taken back to back at calibration_interval().
+        Outliers are dropped and the calibration is refused if the remaining
+        readings spread more than ``max_deviation`` cm.
+        """
+        interval = self.calibration_interval(tank_id)
+        readings = []
+
+        for index in range(samples):
+            if index:
+                await asyncio.sleep(interval)
+            try:
+                readings.append(await self.async_read_distance(tank_id))
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+                _LOGGER.debug("Calibration sample %s on %s failed: %s", index, self.host, err)
+            self.hass.bus.async_fire(
+                EVENT_CALIBRATION_PROGRESS,
+                {
+                    "host": self.host,
+                    "tank_id": tank_id,
+                    "calibration_type": calibration_type,
+                    "collected": len(readings),
+                    "total": samples,
+                },
+            )
+
+        result = evaluate_samples(readings, max_deviation)
+        _LOGGER.debug("Calibration %s on %s tank %r: %s", calibration_type, self.host, tank_id, result)
+        if not result.accepted:
+            raise HomeAssistantError(
+                f"Calibration of {self.tank_name(tank_id)} rejected: {result.reason}"
+            )
+
+        setting = "empty_distance" if calibration_type == CALIBRATION_EMPTY else "full_distance"
+        await self.async_update_settings(tank_id, **{setting: round(result.value, 1)})
+        return result
@@ -0,0 +1,103 @@
+"""Base entity for the AquaLevel integration."""
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import AquaLevelDataUpdateCoordinator
+
+
+class AquaLevelEntity(CoordinatorEntity):
+    """Base class for entities bound to one tank of a controller."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: AquaLevelDataUpdateCoordinator,
+        tank_id: str,
+        description: EntityDescription,
+    ):
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._tank_id = tank_id
+        self._attr_unique_id = f"{coordinator.device_identifier(tank_id)}_{description.key}"
+        self._attr_device_info = coordinator.device_info(tank_id)
+        self._last_update_success = coordinator.last_update_success
+
+    @property
+    def tank_data(self):
+        """Return the latest data for this entity's tank."""
+        return self.coordinator.tanks.get(self._tank_id)
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return super().available and self.tank_data is not None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if this tank changed or availability flipped."""
+        success = self.coordinator.last_update_success
+        if (
+            success == self._last_update_success
+            and self._tank_id not in self.coordinator.changed_tanks
+        ):
+            return
+        self._last_update_success = success
+        self.async_write_ha_state()
+
+
+def supported_descriptions(
+    coordinator: AquaLevelDataUpdateCoordinator, descriptions, tank_ids=None
+):
+    """Yield (tank_id, description) pairs for keys each tank actually reports.
+
+    Descriptions without a ``value_key`` are created for every tank. With
+    ``tank_ids``, only those tanks are considered.
+    """
+    for tank_id, data in coordinator.tanks.items():
+        if tank_ids is not None and tank_id not in tank_ids:
+            continue
+        for description in descriptions:
+            value_key = getattr(description, "value_key", None)
+            if value_key is None or value_key in data:
+                yield tank_id, description
+
+
+@callback
+def async_add_tank_entities(
+    entry: ConfigEntry,
+    coordinator: AquaLevelDataUpdateCoordinator,
+    descriptions,
+    entity_class,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add an entity per supported description for every tank, now and later.
+
+    Tanks that first appear in a later update, in a full payload or a delta,
+    get their device and entities without reloading the entry.
+    """
+    known = set()
+
+    @callback
+    def _async_add_new_tanks(tank_ids) -> None:
+        new = {tank_id for tank_id in tank_ids if tank_id not in known}
+        if not new:
+            return
+        known.update(new)
+        async_add_entities(
+            entity_class(coordinator, tank_id, description)
+            for tank_id, description in supported_descriptions(coordinator, descriptions, new)
+        )
+
+    @callback
+    def _async_handle_coordinator_update() -> None:
+        _async_add_new_tanks(
+            tank_id for tank_id in coordinator.changed_tanks if tank_id in coordinator.tanks
+        )
+
+    _async_add_new_tanks(coordinator.tanks)
+    entry.async_on_unload(coordinator.async_add_listener(_async_handle_coordinator_update))
@@ -0,0 +1,149 @@
+"""Streaming export of AquaLevel tank history to CSV or Parquet."""
+import csv
+import logging
+import os
+from datetime import datetime, timedelta
+
+from homeassistant.components.recorder import history, statistics
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import EXPORT_FORMAT_PARQUET, EXPORT_SOURCE_STATISTICS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Tank entities included in an export, as (platform, unique id suffix)
+EXPORT_ENTITIES = (
+    ("sensor", "water_percentage"),
+    ("sensor", "water_level"),
+    ("sensor", "water_volume"),
+    ("binary_sensor", "low_water_alert"),
+    ("binary_sensor", "high_water_alert"),
+    ("binary_sensor", "rapid_drop_alert"),
+)
+
+STATE_COLUMNS = ("time", "entity_id", "tank", "state")
+STATISTIC_COLUMNS = ("time", "entity_id", "tank", "mean", "min", "max")
+
+# Time span read from the recorder per query
+STATE_CHUNK = timedelta(days=1)
+STATISTIC_CHUNK = timedelta(days=31)
+
+
+def iter_windows(start: datetime, end: datetime, step: timedelta):
+    """Yield consecutive (window_start, window_end) pairs covering start..end."""
+    while start < end:
+        window_end = min(start + step, end)
+        yield start, window_end
+        start = window_end
+
+
+def iter_state_rows(hass: HomeAssistant, entities: dict, start: datetime, end: datetime):
+    """Yield one list of state rows per recorder window and entity."""
+    for window_start, window_end in iter_windows(start, end, STATE_CHUNK):
+        for entity_id, tank in entities.items():
+            states = history.state_changes_during_period(
+                hass,
+                window_start,
+                window_end,
+                entity_id=entity_id,
+                include_start_time_state=False,
+            ).get(entity_id, [])
+            if states:
+                yield [
+                    (state.last_changed.isoformat(), entity_id, tank, state.state)
+                    for state in states
+                ]
+
+
+def iter_statistic_rows(hass: HomeAssistant, entities: dict, start: datetime, end: datetime):
+    """Yield one list of hourly statistic rows per recorder window."""
+    for window_start, window_end in iter_windows(start, end, STATISTIC_CHUNK):
+        result = statistics.statistics_during_period(
+            hass,
+            window_start,
+            window_end,
+            set(entities),
+            "hour",
+            None,
+            {"mean", "min", "max"},
+        )
+        for entity_id, rows in result.items():
+            if rows:
+                yield [
+                    (
+                        dt_util.utc_from_timestamp(row["start"]).isoformat(),
+                        entity_id,
+                        entities[entity_id],
+                        row.get("mean"),
+                        row.get("min"),
+                        row.get("max"),
+                    )
+                    for row in rows
+                ]
+
+
+def write_csv(path: str, columns: tuple, chunks) -> int:
+    """Write row chunks to a CSV file as they arrive; return the row count."""
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        for rows in chunks:
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def write_parquet(path: str, columns: tuple, chunks) -> int:
+    """Write each row chunk as a Parquet row group; return the row count."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as err:
+        raise HomeAssistantError("Parquet export requires pyarrow to be installed") from err
+
+    schema = pa.schema(
+        [
+            (column, pa.float64() if column in ("mean", "min", "max") else pa.string())
+            for column in columns
+        ]
+    )
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            table = pa.Table.from_pylist(
+                [dict(zip(columns, row)) for row in rows], schema=schema
+            )
+            writer.write_table(table)
+            count += len(rows)
+    return count
+
+
+def export_history(
+    hass: HomeAssistant,
+    path: str,
+    entities: dict,
+    start: datetime,
+    end: datetime,
+    source: str,
+    export_format: str,
+) -> int:
+    """Stream the history of ``entities`` (entity_id -> tank name) to ``path``.
+
+    Runs in the recorder executor. Memory use is bounded by one chunk.
+    """
+    if source == EXPORT_SOURCE_STATISTICS:
+        columns, chunks = STATISTIC_COLUMNS, iter_statistic_rows(hass, entities, start, end)
+    else:
+        columns, chunks = STATE_COLUMNS, iter_state_rows(hass, entities, start, end)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if export_format == EXPORT_FORMAT_PARQUET:
+        count = write_parquet(path, columns, chunks)
+    else:
+        count = write_csv(path, columns, chunks)
+
+    _LOGGER.debug("Exported %s rows of %s history to %s", count, source, path)
+    return count
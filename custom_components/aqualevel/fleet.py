@@ -0,0 +1,165 @@
+"""Fleet-wide aggregates across all AquaLevel tanks."""
+import logging
+import time
+from dataclasses import dataclass
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import RATE_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TankSnapshot:
+    """The contribution of one tank to the fleet aggregates."""
+
+    name: str
+    volume: float
+    consumption: float
+    percentage: float | None
+    low_alert: bool
+    high_alert: bool
+    baseline_volume: float
+    baseline_time: float
+
+
+class AquaLevelFleet:
+    """Incrementally maintained totals over every tank of every controller.
+
+    Each tank update replaces that tank's snapshot and applies only the
+    difference to the running totals, so the cost of an update does not
+    grow with the number of tanks. Consumption is measured over a fixed
+    RATE_WINDOW, so it doesn't depend on how often a tank is pushed.
+    """
+
+    def __init__(self):
+        """Initialize empty aggregates."""
+        self._tanks = {}
+        self._listeners = []
+        self.total_volume = 0.0
+        self.total_consumption = 0.0
+        self.low_alerts = 0
+        self.high_alerts = 0
+        self._lowest = None
+
+    @property
+    def tank_count(self) -> int:
+        """Return the number of tanks contributing to the aggregates."""
+        return len(self._tanks)
+
+    @property
+    def lowest(self) -> TankSnapshot | None:
+        """Return the snapshot of the tank with the lowest percentage."""
+        if self._lowest is None:
+            return None
+        return self._tanks.get(self._lowest)
+
+    def is_consuming(self, key: tuple) -> bool:
+        """Return True if a tank has a non-zero consumption rate."""
+        snapshot = self._tanks.get(key)
+        return snapshot is not None and snapshot.consumption != 0
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for aggregate changes; returns a function to unsubscribe."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    @callback
+    def async_update_tanks(self, updates) -> None:
+        """Apply the deltas of new readings.
+
+        ``updates`` are (key, name, data, low_alert, high_alert) tuples, with
+        the alert flags as evaluated by the controller's AlertEngine. A
+        tank's consumption is recomputed once RATE_WINDOW has passed since
+        its baseline; pushes in between keep the rate and the baseline.
+        Tanks with a non-zero rate must be pushed on every update so the
+        rate falls back to zero once the tank stops changing.
+        """
+        now = time.monotonic()
+        for key, name, data, low_alert, high_alert in updates:
+            old = self._tanks.get(key)
+            volume = float(data.get("volume") or 0)
+
+            consumption = 0.0
+            baseline_volume, baseline_time = volume, now
+            if old is not None:
+                consumption = old.consumption
+                baseline_volume, baseline_time = old.baseline_volume, old.baseline_time
+                elapsed = now - old.baseline_time
+                if elapsed >= RATE_WINDOW:
+                    # Litres per hour, positive while the tank is being drawn down
+                    consumption = (old.baseline_volume - volume) * 3600 / elapsed
+                    baseline_volume, baseline_time = volume, now
+
+            new = TankSnapshot(
+                name=name,
+                volume=volume,
+                consumption=consumption,
+                percentage=data.get("percentage"),
+                low_alert=low_alert,
+                high_alert=high_alert,
+                baseline_volume=baseline_volume,
+                baseline_time=baseline_time,
+            )
+            self._tanks[key] = new
+            self._apply(old, new)
+            self._update_lowest(key, old, new)
+        self._notify()
+
+    @callback
+    def async_remove_tanks(self, keys) -> None:
+        """Withdraw the contribution of the given tanks from the aggregates."""
+        removed = False
+        for key in keys:
+            old = self._tanks.pop(key, None)
+            if old is None:
+                continue
+            removed = True
+            self._apply(old, None)
+            if self._lowest == key:
+                self._recompute_lowest()
+        if removed:
+            self._notify()
+
+    def _apply(self, old: TankSnapshot | None, new: TankSnapshot | None) -> None:
+        """Move the running totals from ``old`` to ``new``."""
+        for sign, snapshot in ((-1, old), (1, new)):
+            if snapshot is None:
+                continue
+            self.total_volume += sign * snapshot.volume
+            self.total_consumption += sign * snapshot.consumption
+            self.low_alerts += sign * snapshot.low_alert
+            self.high_alerts += sign * snapshot.high_alert
+
+    def _update_lowest(self, key: tuple, old: TankSnapshot | None, new: TankSnapshot) -> None:
+        """Keep track of the lowest tank, scanning only when it rose."""
+        if self._lowest == key:
+            if new.percentage is None or (
+                old is not None
+                and old.percentage is not None
+                and new.percentage > old.percentage
+            ):
+                self._recompute_lowest()
+            return
+
+        lowest = self.lowest
+        if new.percentage is not None and (
+            lowest is None or lowest.percentage is None or new.percentage < lowest.percentage
+        ):
+            self._lowest = key
+
+    def _recompute_lowest(self) -> None:
+        """Find the lowest tank by scanning all snapshots."""
+        candidates = [
+            (snapshot.percentage, key)
+            for key, snapshot in self._tanks.items()
+            if snapshot.percentage is not None
+        ]
+        self._lowest = min(candidates)[1] if candidates else None
+
+    def _notify(self) -> None:
+        """Tell fleet sensors the aggregates changed."""
+        for update_callback in list(self._listeners):
+            update_callback()
@@ -0,0 +1,117 @@
+"""MQTT transport for the AquaLevel integration."""
+import asyncio
+import json
+import logging
+
+from homeassistant.components import mqtt
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import ATTR_DELTA, TOPIC_SETTINGS, TOPIC_TANK_DATA
+from .coordinator import AquaLevelDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AquaLevelMqttCoordinator(AquaLevelDataUpdateCoordinator):
+    """Receive readings from MQTT topics instead of polling /tank-data.
+
+    The device publishes readings to ``<topic>/tank-data`` and settings to
+    ``<topic>/settings``, ideally retained, in the same format as the HTTP
+    payloads. Later messages are merged into the snapshot field by field.
+    Settings writes go out as JSON to ``<topic>/settings/set``. The base
+    topic takes the place of the host in unique ids and device identifiers.
+    """
+
+    def __init__(self, hass: HomeAssistant, topic: str, name: str, options: dict | None = None):
+        """Initialize the coordinator."""
+        super().__init__(hass, None, topic, name, options)
+        self.topic = topic
+        self._waiters = []
+        self._unsubscribe = []
+
+    @callback
+    def async_apply_options(self, options: dict) -> None:
+        """Apply options; readings are pushed, so there is no poll interval."""
+        super().async_apply_options(options)
+        self.update_interval = None
+
+    async def async_start(self) -> None:
+        """Subscribe to the device topics once the MQTT client is ready."""
+        if not await mqtt.async_wait_for_mqtt_client(self.hass):
+            raise ConfigEntryNotReady("MQTT client is not available")
+        for suffix in (TOPIC_TANK_DATA, TOPIC_SETTINGS):
+            self._unsubscribe.append(
+                await mqtt.async_subscribe(
+                    self.hass, f"{self.topic}/{suffix}", self._async_handle_message, qos=1
+                )
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Unsubscribe from the device topics."""
+        while self._unsubscribe:
+            self._unsubscribe.pop()()
+
+    @callback
+    def _async_handle_message(self, msg) -> None:
+        """Merge a published payload and notify entities."""
+        try:
+            payload = json.loads(msg.payload)
+        except ValueError:
+            _LOGGER.warning("Invalid JSON on %s: %s", msg.topic, msg.payload)
+            return
+        if not isinstance(payload, dict):
+            return
+
+        # Readings and settings arrive on separate topics, so once there is a
+        # snapshot every message amends it rather than replacing it
+        if self.data is not None:
+            payload = {**payload, ATTR_DELTA: True}
+
+        if self.profiler is not None:
+            self.profiler.enable()
+        try:
+            data = self._async_process_payload(payload)
+            self.async_set_updated_data(data)
+        finally:
+            if self.profiler is not None:
+                self.profiler.disable()
+
+        if msg.topic.endswith(f"/{TOPIC_SETTINGS}"):
+            return
+        while self._waiters:
+            waiter = self._waiters.pop()
+            if not waiter.done():
+                waiter.set_result(data)
+
+    async def _async_update_data(self):
+        """Wait for the first report; after that the data is pushed."""
+        if self.data is not None:
+            self.changed_tanks = set()
+            return self.data
+        try:
+            return await self.async_fetch_payload()
+        except asyncio.TimeoutError as err:
+            raise UpdateFailed(f"No report on {self.topic}/{TOPIC_TANK_DATA} yet") from err
+
+    async def async_fetch_payload(self, params: dict | None = None, wait: int = 0) -> dict:
+        """Wait for the next report from the device."""
+        waiter = self.hass.loop.create_future()
+        self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, self.timeout + wait)
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def calibration_interval(self, tank_id: str) -> float:
+        """Each sample already waits for the next report, so don't pause."""
+        return 0
+
+    async def _async_post(self, path: str, data: dict) -> None:
+        """Publish a command to the device."""
+        await mqtt.async_publish(
+            self.hass, f"{self.topic}{path}/set", json.dumps(data), qos=1
+        )
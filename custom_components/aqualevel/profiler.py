@@ -0,0 +1,158 @@
+"""On-demand profiling of AquaLevel coordinator refresh cycles."""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import tracemalloc
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_PROFILE, EVENT_PROFILE_COMPLETE, PROFILE_DIRECTORY
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of entries written to the text reports
+REPORT_LIMIT = 50
+
+
+class ProfiledCoroutine:
+    """Await a coroutine with the profiler enabled only while it runs.
+
+    The profiler is switched off whenever the coroutine yields to the event
+    loop, so time spent in other integrations' tasks is not attributed to it.
+    """
+
+    def __init__(self, coro, profiler: cProfile.Profile):
+        """Wrap ``coro``."""
+        self._coro = coro
+        self._profiler = profiler
+
+    def __await__(self):
+        """Drive the wrapped coroutine one step at a time."""
+        iterator = self._coro.__await__()
+        value, error = None, None
+        while True:
+            self._profiler.enable()
+            try:
+                if error is not None:
+                    future = iterator.throw(error)
+                else:
+                    future = iterator.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self._profiler.disable()
+            try:
+                value, error = (yield future), None
+            except GeneratorExit:
+                iterator.close()
+                raise
+            except BaseException as err:  # pylint: disable=broad-except
+                value, error = None, err
+
+
+class ProfileSession:
+    """A time-limited profile of the refresh path of some coordinators."""
+
+    def __init__(self, hass: HomeAssistant, coordinators: list, duration: int, memory: bool):
+        """Initialize the session."""
+        self.hass = hass
+        self.coordinators = coordinators
+        self.duration = duration
+        self.memory = memory
+        self.profiler = cProfile.Profile()
+        self._started_tracemalloc = False
+        self._snapshot = None
+        self._cancel_stop = None
+        self._name = f"aqualevel_{dt_util.now():%Y%m%d_%H%M%S}"
+
+    async def async_start(self) -> None:
+        """Attach the profiler and schedule the session to end by itself."""
+        if self.hass.data.get(DATA_PROFILE) is not None:
+            raise HomeAssistantError("An AquaLevel profile is already running")
+        try:
+            self.profiler.enable()
+            self.profiler.disable()
+        except ValueError as err:
+            raise HomeAssistantError(f"Cannot start profiler: {err}") from err
+        self.hass.data[DATA_PROFILE] = self
+
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            # Snapshotting a whole instance can take seconds; keep it off the loop
+            self._snapshot = await self.hass.async_add_executor_job(tracemalloc.take_snapshot)
+
+        for coordinator in self.coordinators:
+            coordinator.profiler = self.profiler
+        self._cancel_stop = async_call_later(
+            self.hass, timedelta(seconds=self.duration), self._async_stop_later
+        )
+        _LOGGER.info(
+            "Profiling %s AquaLevel device(s) for %s s", len(self.coordinators), self.duration
+        )
+
+    async def _async_stop_later(self, _now) -> None:
+        """Finish the session when its duration elapses."""
+        self._cancel_stop = None
+        await self.async_stop()
+
+    async def async_stop(self) -> None:
+        """Detach the profiler and write the reports."""
+        if self._cancel_stop is not None:
+            self._cancel_stop()
+            self._cancel_stop = None
+        for coordinator in self.coordinators:
+            if coordinator.profiler is self.profiler:
+                coordinator.profiler = None
+        self.hass.data.pop(DATA_PROFILE, None)
+
+        snapshot = None
+        if self.memory:
+            snapshot = await self.hass.async_add_executor_job(tracemalloc.take_snapshot)
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+        directory = self.hass.config.path(PROFILE_DIRECTORY)
+        files = await self.hass.async_add_executor_job(
+            self._write_reports, directory, snapshot
+        )
+        _LOGGER.info("AquaLevel profile written to %s", ", ".join(files))
+        self.hass.bus.async_fire(EVENT_PROFILE_COMPLETE, {"files": files})
+
+    def _write_reports(self, directory: str, snapshot) -> list:
+        """Write the .prof dump and text summaries; runs in the executor."""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, self._name)
+        files = [f"{base}.prof", f"{base}.txt"]
+
+        self.profiler.dump_stats(files[0])
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_LIMIT)
+        with open(files[1], "w", encoding="utf-8") as file:
+            file.write(stream.getvalue())
+
+        if snapshot is not None and self._snapshot is not None:
+            files.append(f"{base}_alloc.txt")
+            package = os.path.dirname(__file__)
+            with open(files[2], "w", encoding="utf-8") as file:
+                for title, filters in (
+                    ("AquaLevel allocations", [tracemalloc.Filter(True, f"{package}{os.sep}*")]),
+                    ("All allocations", []),
+                ):
+                    file.write(f"{title} (growth during the session)\n")
+                    diff = snapshot.filter_traces(filters).compare_to(
+                        self._snapshot.filter_traces(filters), "lineno"
+                    )
+                    for stat in diff[:REPORT_LIMIT]:
+                        file.write(f"{stat}\n")
+                    file.write("\n")
+
+        return files
@@ -0,0 +1,206 @@
+"""Hysteresis fill-pump controller driven from the coordinator update path."""
+import logging
+import time
+
+import voluptuous as vol
+
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    CONF_HOST,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_ON,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    CONF_DRY_RUN_MIN_RISE,
+    CONF_DRY_RUN_TIMEOUT,
+    CONF_LOCKOUT,
+    CONF_MAX_RUNTIME,
+    CONF_START_BELOW,
+    CONF_STOP_ABOVE,
+    CONF_SWITCH,
+    CONF_TANK,
+    DEFAULT_TANK_ID,
+    EVENT_PUMP_CONTROLLER,
+)
+from .coordinator import AquaLevelDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _valid_band(config: dict) -> dict:
+    """Require the stop level to be above the start level."""
+    if config[CONF_STOP_ABOVE] <= config[CONF_START_BELOW]:
+        raise vol.Invalid(f"{CONF_STOP_ABOVE} must be greater than {CONF_START_BELOW}")
+    return config
+
+
+PUMP_CONTROLLER_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(CONF_HOST): cv.string,
+            vol.Optional(CONF_TANK, default=DEFAULT_TANK_ID): cv.string,
+            vol.Required(CONF_SWITCH): cv.entity_id,
+            vol.Required(CONF_START_BELOW): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+            vol.Required(CONF_STOP_ABOVE): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+            vol.Optional(CONF_MAX_RUNTIME, default=1800): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(CONF_DRY_RUN_TIMEOUT, default=300): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(CONF_DRY_RUN_MIN_RISE, default=1.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_LOCKOUT, default=3600): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        }
+    ),
+    _valid_band,
+)
+
+
+class PumpController:
+    """Run a fill pump between two tank levels with runtime and dry-run guards.
+
+    The pump is switched on at or below ``start_below`` percent and off at or
+    above ``stop_above``. It is also stopped, and further starts are locked
+    out for ``lockout`` seconds, if it runs longer than ``max_runtime`` or the
+    level has not risen by ``dry_run_min_rise`` points within
+    ``dry_run_timeout`` seconds of starting. The runtime limit is enforced
+    by a timer, and the pump is stopped when the device stops reporting,
+    so neither depends on readings arriving.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: AquaLevelDataUpdateCoordinator,
+        config: dict,
+    ):
+        """Initialize the controller."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.tank_id = config[CONF_TANK]
+        self.switch = config[CONF_SWITCH]
+        self.start_below = config[CONF_START_BELOW]
+        self.stop_above = config[CONF_STOP_ABOVE]
+        self.max_runtime = config[CONF_MAX_RUNTIME]
+        self.dry_run_timeout = config[CONF_DRY_RUN_TIMEOUT]
+        self.dry_run_min_rise = config[CONF_DRY_RUN_MIN_RISE]
+        self.lockout = config[CONF_LOCKOUT]
+        self._started_at = None
+        self._start_level = None
+        self._locked_until = None
+        self._cancel_runtime = None
+
+    def _pump_is_on(self) -> bool:
+        """Return True if the bound switch is currently on."""
+        state = self.hass.states.get(self.switch)
+        return state is not None and state.state == STATE_ON
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the runtime timer when the entry unloads."""
+        self._async_cancel_runtime()
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Evaluate the latest reading; called from the coordinator listener."""
+        if not self.coordinator.last_update_success:
+            if self._pump_is_on():
+                self._async_stop(None, "device not reporting")
+            return
+        if self.tank_id not in self.coordinator.changed_tanks and not self._pump_is_on():
+            return
+
+        data = self.coordinator.tanks.get(self.tank_id)
+        level = data.get("percentage") if data else None
+        if level is None:
+            return
+
+        now = time.monotonic()
+        if self._pump_is_on():
+            if self._started_at is None:
+                # Switched on outside the controller; guard it all the same
+                self._started_at, self._start_level = now, level
+                self._async_start_runtime(self.max_runtime)
+            runtime = now - self._started_at
+
+            if level >= self.stop_above:
+                self._async_stop(level, "level reached")
+            elif runtime >= self.max_runtime:
+                self._async_stop(level, "maximum runtime exceeded", lock=True)
+            elif (
+                self.dry_run_timeout
+                and runtime >= self.dry_run_timeout
+                and level - self._start_level < self.dry_run_min_rise
+            ):
+                self._async_stop(level, "level not rising, possible dry run", lock=True)
+            return
+
+        self._started_at = None
+        if self._locked_until is not None and now < self._locked_until:
+            return
+        self._locked_until = None
+        if level <= self.start_below:
+            self._async_start(level)
+
+    @callback
+    def _async_start(self, level: float) -> None:
+        """Switch the pump on."""
+        self._started_at = time.monotonic()
+        self._start_level = level
+        self._async_start_runtime(self.max_runtime)
+        self._async_switch(SERVICE_TURN_ON, level, "level low")
+
+    @callback
+    def _async_start_runtime(self, delay: float) -> None:
+        """Stop the pump after ``delay`` seconds, whatever readings arrive."""
+        self._async_cancel_runtime()
+        self._cancel_runtime = async_call_later(self.hass, delay, self._async_runtime_elapsed)
+
+    @callback
+    def _async_cancel_runtime(self) -> None:
+        """Cancel the runtime timer."""
+        if self._cancel_runtime is not None:
+            self._cancel_runtime()
+            self._cancel_runtime = None
+
+    @callback
+    def _async_runtime_elapsed(self, _now) -> None:
+        """Stop and lock out a pump that ran for the maximum runtime."""
+        self._cancel_runtime = None
+        data = self.coordinator.tanks.get(self.tank_id) or {}
+        self._async_stop(data.get("percentage"), "maximum runtime exceeded", lock=True)
+
+    @callback
+    def _async_stop(self, level: float | None, reason: str, lock: bool = False) -> None:
+        """Switch the pump off, optionally locking out restarts."""
+        self._started_at = None
+        self._async_cancel_runtime()
+        if lock:
+            self._locked_until = time.monotonic() + self.lockout
+            _LOGGER.warning(
+                "Stopping %s for %s: %s; locked out for %s s",
+                self.switch, self.coordinator.tank_name(self.tank_id), reason, self.lockout,
+            )
+        self._async_switch(SERVICE_TURN_OFF, level, reason)
+
+    @callback
+    def _async_switch(self, service: str, level: float | None, reason: str) -> None:
+        """Call the switch service without waiting and announce the action."""
+        _LOGGER.debug("%s %s at %s%%: %s", service, self.switch, level, reason)
+        self.hass.async_create_task(
+            self.hass.services.async_call(
+                "homeassistant", service, {ATTR_ENTITY_ID: self.switch}
+            )
+        )
+        self.hass.bus.async_fire(
+            EVENT_PUMP_CONTROLLER,
+            {
+                "host": self.coordinator.host,
+                "tank_id": self.tank_id,
+                "switch": self.switch,
+                "action": service,
+                "level": level,
+                "reason": reason,
+            },
+        )
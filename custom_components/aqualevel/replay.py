@@ -0,0 +1,360 @@
+"""Replay recorded AquaLevel traffic to measure the cost of the update path.
+
+Traces recorded with the ``aqualevel.record_trace`` service are fed through
+a real Home Assistant instance with the integration and all of its entity
+platforms set up, without any network. Run from the repository root:
+
+    python -m custom_components.aqualevel.replay traces/*.jsonl.gz \\
+        --baseline traces/baseline.json
+
+CPU time, state writes and allocated memory are reported per update. With
+``--baseline``, the exit status is 1 if a trace got slower, writes more or
+allocates more than the baseline allows, so the command can gate local CI.
+"""
+import argparse
+import asyncio
+import contextlib
+import inspect
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from types import MappingProxyType
+from unittest import mock
+
+from homeassistant.config_entries import SOURCE_USER, ConfigEntry, ConfigEntryState
+from homeassistant.const import CONF_HOST, EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant, callback
+
+from . import alerts, fleet, pump
+from .const import DOMAIN, TOPIC_SETTINGS, TOPIC_TANK_DATA
+from .coordinator import AquaLevelDataUpdateCoordinator
+from .trace import read_trace
+
+_LOGGER = logging.getLogger(__name__)
+
+# Metrics compared against a baseline, with the absolute slack allowed on top
+# of the relative tolerance so that near-zero values don't fail on noise
+CHECKED_METRICS = {
+    "cpu_ms_mean": 0.05,
+    "cpu_ms_p95": 0.1,
+    "writes_mean": 0.0,
+    "alloc_kib_mean": 1.0,
+}
+DEFAULT_TOLERANCE = 0.25
+
+_NO_REPORT = object()
+
+
+class AquaLevelReplayCoordinator(AquaLevelDataUpdateCoordinator):
+    """Serve /tank-data reports and settings writes from a recorded trace.
+
+    Nothing is polled: each call to async_replay_next() applies the next
+    recorded exchange. Settings writes are counted instead of being sent.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        header: dict,
+        events: list,
+        name: str,
+        options: dict | None = None,
+    ):
+        """Initialize the coordinator, by default with the options the trace was recorded with."""
+        super().__init__(
+            hass, None, header["host"], name, dict(header["options"] if options is None else options)
+        )
+        self.events = deque(events)
+        self.settings_writes = 0
+        self._report = _NO_REPORT
+
+    @callback
+    def async_apply_options(self, options: dict) -> None:
+        """Apply options; updates are driven by the trace, not a timer."""
+        super().async_apply_options(options)
+        self.update_interval = None
+
+    @callback
+    def _async_schedule_next(self) -> None:
+        """Keep the timer off; updates are driven by the trace."""
+
+    async def async_fetch_payload(self, params: dict | None = None, wait: int = 0) -> dict | None:
+        """Return the report being replayed.
+
+        Outside async_replay_next(), e.g. for the first refresh, the next
+        recorded report is taken from the trace.
+        """
+        if self._report is not _NO_REPORT:
+            report, self._report = self._report, _NO_REPORT
+            return report
+        while self.events:
+            _offset, kind, data = self.events.popleft()
+            if kind == TOPIC_TANK_DATA and data is not None:
+                return data
+        raise asyncio.TimeoutError("End of trace")
+
+    async def _async_post(self, path: str, data: dict) -> None:
+        """Count a settings write."""
+        self.settings_writes += 1
+
+    async def async_replay_next(self) -> str:
+        """Apply the next recorded exchange and return its kind."""
+        _offset, kind, data = self.events.popleft()
+        if kind == TOPIC_SETTINGS:
+            await self._async_post(f"/{TOPIC_SETTINGS}", data)
+        else:
+            self._report = data
+            await self.async_refresh()
+        return kind
+
+
+def _replay_entry(header: dict) -> ConfigEntry:
+    """Return a config entry for the recorded device, with its recorded options."""
+    fields = {
+        "version": 1,
+        "minor_version": 1,
+        "domain": DOMAIN,
+        "title": header["name"],
+        "data": {CONF_HOST: header["host"]},
+        "options": header["options"],
+        "source": SOURCE_USER,
+        "unique_id": None,
+        "discovery_keys": MappingProxyType({}),
+        "subentries_data": None,
+    }
+    # Releases differ in which fields they take and require; pass the ones
+    # this release knows about
+    parameters = inspect.signature(ConfigEntry).parameters
+    return ConfigEntry(**{key: value for key, value in fields.items() if key in parameters})
+
+
+def summarize(cpu: list, writes: list, allocations: list) -> dict:
+    """Summarize per-update samples."""
+    summary = {"updates": len(cpu)}
+    if cpu:
+        cpu_ms = sorted(value * 1000 for value in cpu)
+        summary.update(
+            cpu_ms_mean=round(statistics.fmean(cpu_ms), 4),
+            cpu_ms_p95=round(cpu_ms[int(0.95 * (len(cpu_ms) - 1))], 4),
+            cpu_ms_max=round(cpu_ms[-1], 4),
+            writes_mean=round(statistics.fmean(writes), 3),
+            writes_max=max(writes),
+            writes_total=sum(writes),
+        )
+    if allocations:
+        summary.update(
+            alloc_kib_mean=round(statistics.fmean(allocations) / 1024, 3),
+            alloc_kib_max=round(max(allocations) / 1024, 3),
+        )
+    return summary
+
+
+class ReplayClock:
+    """Stand-in for the ``time`` module whose monotonic() follows the trace.
+
+    Installed in the modules that measure elapsed time, so rates, dwell
+    times and pump guards see the recorded gaps however fast the trace is
+    replayed. Everything else is the real ``time`` module.
+    """
+
+    def __init__(self, offset: float = 0.0):
+        """Start the clock at ``offset`` seconds into the trace."""
+        self._started = time.monotonic()
+        self.offset = offset
+
+    def monotonic(self) -> float:
+        """Return the simulated monotonic time."""
+        return self._started + self.offset
+
+    def __getattr__(self, name: str):
+        """Fall back to the real time module."""
+        return getattr(time, name)
+
+
+@contextlib.contextmanager
+def _patch_clock(clock: ReplayClock):
+    """Install ``clock`` in every module that measures elapsed time."""
+    with contextlib.ExitStack() as stack:
+        for module in (alerts, fleet, pump):
+            stack.enter_context(mock.patch.object(module, "time", clock))
+        yield clock
+
+
+async def async_replay_trace(
+    hass: HomeAssistant, path: str, speed: float = 0, memory: bool = False
+) -> dict:
+    """Replay one trace through a temporary config entry and return its summary.
+
+    The entry is added here rather than through a config flow, and set up
+    with the coordinator swapped for one that serves the trace. The
+    integration's clock is moved to each exchange's recorded offset before
+    it is applied. With ``speed`` set, the recorded gaps between exchanges
+    are kept, divided by ``speed``; otherwise exchanges follow each other
+    immediately. With ``memory``, allocations are traced, which inflates the
+    CPU times.
+    """
+    header, events = await hass.async_add_executor_job(read_trace, path)
+    entry = _replay_entry(header)
+
+    def _replay_coordinator(hass, _session, _host, name, options):
+        return AquaLevelReplayCoordinator(hass, header, events, name, options)
+
+    with _patch_clock(ReplayClock(events[0][0] if events else 0.0)) as clock:
+        integration = sys.modules[__package__]
+        with mock.patch.object(integration, "AquaLevelDataUpdateCoordinator", _replay_coordinator):
+            await hass.config_entries.async_add(entry)
+        if entry.state is not ConfigEntryState.LOADED:
+            await hass.config_entries.async_remove(entry.entry_id)
+            raise RuntimeError(f"{path}: setting up the replay entry failed")
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        await hass.async_block_till_done()
+
+        writes = 0
+
+        @callback
+        def _async_count_write(_event) -> None:
+            nonlocal writes
+            writes += 1
+
+        unsubscribe = hass.bus.async_listen(EVENT_STATE_CHANGED, _async_count_write)
+        cpu_samples, write_samples, allocation_samples = [], [], []
+        if memory:
+            tracemalloc.start()
+        try:
+            previous = None
+            while coordinator.events:
+                offset = coordinator.events[0][0]
+                if speed and previous is not None:
+                    await asyncio.sleep(max(offset - previous, 0) / speed)
+                previous = offset
+                clock.offset = max(offset, clock.offset)
+
+                writes = 0
+                if memory:
+                    tracemalloc.reset_peak()
+                    allocated = tracemalloc.get_traced_memory()[0]
+                started = time.process_time()
+                kind = await coordinator.async_replay_next()
+                elapsed = time.process_time() - started
+                if memory:
+                    allocation = tracemalloc.get_traced_memory()[1] - allocated
+
+                if kind == TOPIC_TANK_DATA:
+                    cpu_samples.append(elapsed)
+                    write_samples.append(writes)
+                    if memory:
+                        allocation_samples.append(allocation)
+                # Let tasks spawned by the update finish outside the measurement
+                await hass.async_block_till_done()
+        finally:
+            if memory:
+                tracemalloc.stop()
+            unsubscribe()
+            await hass.config_entries.async_remove(entry.entry_id)
+
+    summary = summarize(cpu_samples, write_samples, allocation_samples)
+    summary["settings_writes"] = coordinator.settings_writes
+    return summary
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return a message for every metric that got worse than the baseline allows."""
+    regressions = []
+    for trace, summary in results.items():
+        expected = baseline.get(trace)
+        if expected is None:
+            continue
+        for metric, slack in CHECKED_METRICS.items():
+            if metric not in summary or metric not in expected:
+                continue
+            limit = expected[metric] * (1 + tolerance) + slack
+            if summary[metric] > limit:
+                regressions.append(
+                    f"{trace}: {metric} {summary[metric]} > {limit:.4g} "
+                    f"(baseline {expected[metric]})"
+                )
+    return regressions
+
+
+async def async_run(args: argparse.Namespace) -> dict:
+    """Start a bare Home Assistant instance and replay every trace."""
+    from homeassistant import bootstrap, loader
+
+    results = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.config.skip_pip = True
+        loader.async_setup(hass)
+        if await bootstrap.async_from_config_dict({"homeassistant": {}}, hass) is None:
+            raise RuntimeError("Home Assistant failed to start")
+        await hass.async_start()
+        try:
+            for path in args.traces:
+                summary = await async_replay_trace(hass, path, args.speed)
+                if args.memory:
+                    # A separate pass, so tracing doesn't distort the CPU times
+                    allocations = await async_replay_trace(hass, path, memory=True)
+                    summary.update(
+                        (key, value) for key, value in allocations.items()
+                        if key.startswith("alloc_")
+                    )
+                results[os.path.basename(path)] = summary
+        finally:
+            await hass.async_stop()
+    return results
+
+
+def main(argv: list | None = None) -> int:
+    """Replay traces from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.aqualevel.replay", description=__doc__.split("\n")[0]
+    )
+    parser.add_argument("traces", nargs="+", help="trace files written by aqualevel.record_trace")
+    parser.add_argument(
+        "--speed", type=float, default=0,
+        help="replay at this multiple of recorded time; 0 (default) for no delays",
+    )
+    parser.add_argument(
+        "--no-memory", dest="memory", action="store_false",
+        help="skip the allocation pass",
+    )
+    parser.add_argument("--baseline", help="fail if results regress against this JSON file")
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+        help="allowed relative increase over the baseline (default %(default)s)",
+    )
+    parser.add_argument("--save-baseline", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(async_run(args))
+
+    for trace, summary in results.items():
+        print(trace)
+        for key, value in summary.items():
+            print(f"  {key}: {value}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
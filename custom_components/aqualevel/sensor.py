@@ -1,78 +1,224 @@
 """Platform for AquaLevel sensor integration."""
 import logging
-import asyncio
-from datetime import timedelta
+from collections.abc import Callable
+from dataclasses import dataclass
 
-from homeassistant.components.sensor import SensorEntity
-from homeassistant.const import PERCENTAGE
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import PERCENTAGE, VOLUME_LITERS, UnitOfLength, UnitOfTime
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN
+from .const import CONF_SENSORS, DATA_FLEET, DOMAIN
+from .entity import AquaLevelEntity, async_add_tank_entities
+from .fleet import AquaLevelFleet
 
 _LOGGER = logging.getLogger(__name__)
 
-SCAN_INTERVAL = timedelta(seconds=30)
+
+@dataclass(frozen=True, kw_only=True)
+class AquaLevelSensorEntityDescription(SensorEntityDescription):
+    """Describes an AquaLevel sensor entity."""
+
+    value_key: str
+
+
+SENSOR_DESCRIPTIONS = (
+    AquaLevelSensorEntityDescription(
+        key="water_percentage",
+        value_key="percentage",
+        name="Water Percentage",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water-percent",
+    ),
+    AquaLevelSensorEntityDescription(
+        key="water_level",
+        value_key="waterLevel",
+        name="Water Level",
+        native_unit_of_measurement=UnitOfLength.CENTIMETERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:waves-arrow-up",
+    ),
+    AquaLevelSensorEntityDescription(
+        key="water_volume",
+        value_key="volume",
+        name="Water Volume",
+        native_unit_of_measurement=VOLUME_LITERS,
+        device_class=SensorDeviceClass.VOLUME,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water",
+    ),
+    AquaLevelSensorEntityDescription(
+        key="distance",
+        value_key="distance",
+        name="Distance",
+        native_unit_of_measurement=UnitOfLength.CENTIMETERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:signal-distance-variant",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    AquaLevelSensorEntityDescription(
+        key="tank_capacity",
+        value_key="tankVolume",
+        name="Tank Capacity",
+        native_unit_of_measurement=VOLUME_LITERS,
+        device_class=SensorDeviceClass.VOLUME,
+        icon="mdi:tank",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    AquaLevelSensorEntityDescription(
+        key="measurement_interval",
+        value_key="measurementInterval",
+        name="Measurement Interval",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        icon="mdi:timer-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class AquaLevelFleetSensorEntityDescription(SensorEntityDescription):
+    """Describes a fleet aggregate sensor."""
+
+    value_fn: Callable[[AquaLevelFleet], float | int | None]
+    attributes_fn: Callable[[AquaLevelFleet], dict] | None = None
+
+
+FLEET_SENSOR_DESCRIPTIONS = (
+    AquaLevelFleetSensorEntityDescription(
+        key="fleet_total_volume",
+        name="AquaLevel Fleet Total Volume",
+        native_unit_of_measurement=VOLUME_LITERS,
+        device_class=SensorDeviceClass.VOLUME,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water",
+        value_fn=lambda fleet: round(fleet.total_volume, 1),
+        attributes_fn=lambda fleet: {"tanks": fleet.tank_count},
+    ),
+    AquaLevelFleetSensorEntityDescription(
+        key="fleet_consumption_rate",
+        name="AquaLevel Fleet Consumption Rate",
+        native_unit_of_measurement="L/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water-minus",
+        value_fn=lambda fleet: round(fleet.total_consumption, 1),
+    ),
+    AquaLevelFleetSensorEntityDescription(
+        key="fleet_low_alerts",
+        name="AquaLevel Fleet Tanks Low",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water-alert",
+        value_fn=lambda fleet: fleet.low_alerts,
+    ),
+    AquaLevelFleetSensorEntityDescription(
+        key="fleet_high_alerts",
+        name="AquaLevel Fleet Tanks High",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water-alert",
+        value_fn=lambda fleet: fleet.high_alerts,
+    ),
+    AquaLevelFleetSensorEntityDescription(
+        key="fleet_lowest_tank",
+        name="AquaLevel Fleet Lowest Tank",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water-percent-alert",
+        value_fn=lambda fleet: fleet.lowest.percentage if fleet.lowest else None,
+        attributes_fn=lambda fleet: {"tank": fleet.lowest.name if fleet.lowest else None},
+    ),
+)
+
+
+async def async_setup_platform(
+    hass: HomeAssistant, config, async_add_entities: AddEntitiesCallback, discovery_info=None
+):
+    """Set up the fleet aggregate sensors, loaded once per integration."""
+    if discovery_info is None:
+        return
+
+    fleet = hass.data[DATA_FLEET]
+    async_add_entities(
+        AquaLevelFleetSensor(fleet, description) for description in FLEET_SENSOR_DESCRIPTIONS
+    )
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ):
     """Set up AquaLevel sensor based on a config entry."""
-    host = entry.data["host"]
-    session = async_get_clientsession(hass)
-    
-    async_add_entities([AquaLevelSensor(host, session)], True)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    enabled = entry.options.get(CONF_SENSORS)
+    descriptions = [
+        description for description in SENSOR_DESCRIPTIONS
+        if enabled is None or description.key in enabled
+    ]
 
-class AquaLevelSensor(SensorEntity):
-    """Representation of an AquaLevel sensor."""
+    async_add_tank_entities(entry, coordinator, descriptions, AquaLevelSensor, async_add_entities)
 
-    def __init__(self, host, session):
-        """Initialize the sensor."""
-        self._host = host
-        self._session = session
-        self._name = "AquaLevel Water Percentage"
-        self._attr_unique_id = f"{host}_water_percentage"
-        self._attr_native_unit_of_measurement = PERCENTAGE
-        self._attr_should_poll = True
-        self._available = True
-        self._state = None
-        self._attr_icon = "mdi:water-percent"
 
-    @property
-    def name(self):
-        """Return the name of the sensor."""
-        return self._name
+class AquaLevelSensor(AquaLevelEntity, SensorEntity):
+    """Representation of an AquaLevel sensor."""
+
+    entity_description: AquaLevelSensorEntityDescription
 
     @property
-    def available(self):
+    def available(self) -> bool:
         """Return True if entity is available."""
-        return self._available
+        return super().available and self.entity_description.value_key in self.tank_data
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self._state
-
-    async def async_update(self):
-        """Get the latest data and update states."""
-        try:
-            url = f"http://{self._host}/tank-data"
-            async with self._session.get(url, timeout=10) as resp:
-                if resp.status == 200:
-                    try:
-                        data = await resp.json()
-                        self._state = data.get("percentage")
-                        self._available = True
-                        _LOGGER.debug(f"Data update successful: {data}")
-                    except:
-                        # Try to parse as text if not json
-                        text = await resp.text()
-                        _LOGGER.debug(f"Response not JSON, got: {text}")
-                        self._available = False
-                else:
-                    self._available = False
-        except Exception as err:
-            _LOGGER.error(f"Error fetching data: {err}")
-            self._available = False
+        if not self.tank_data:
+            return None
+        return self.tank_data.get(self.entity_description.value_key)
+
+
+class AquaLevelFleetSensor(SensorEntity):
+    """Sensor exposing one aggregate over all AquaLevel tanks."""
+
+    _attr_should_poll = False
+    entity_description: AquaLevelFleetSensorEntityDescription
+
+    def __init__(self, fleet: AquaLevelFleet, description: AquaLevelFleetSensorEntityDescription):
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._fleet = fleet
+        self._attr_unique_id = f"{DOMAIN}_{description.key}"
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = None
+        self._refresh()
+
+    def _refresh(self) -> bool:
+        """Read the aggregate; return True if the state changed."""
+        description = self.entity_description
+        value = description.value_fn(self._fleet)
+        attributes = description.attributes_fn(self._fleet) if description.attributes_fn else None
+        changed = (value, attributes) != (self._attr_native_value, self._attr_extra_state_attributes)
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = attributes
+        return changed
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to fleet changes."""
+        self.async_on_remove(self._fleet.async_add_listener(self._handle_fleet_update))
+
+    @callback
+    def _handle_fleet_update(self) -> None:
+        """Write state only when this aggregate actually changed."""
+        if self._refresh():
+            self.async_write_ha_state()
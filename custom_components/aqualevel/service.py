@@ -1,9 +1,16 @@
 """AquaLevel services."""
+import asyncio
 import logging
+import os
 import voluptuous as vol
 
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.components.recorder import get_instance
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
 from homeassistant.const import (
     UnitOfLength, 
     PERCENTAGE, 
@@ -15,8 +22,20 @@ from .const import (
     DOMAIN,
     SERVICE_CALIBRATE,
     SERVICE_UPDATE_SETTINGS,
+    SERVICE_EXPORT_HISTORY,
+    SERVICE_PROFILE,
+    SERVICE_RECORD_TRACE,
     ATTR_ENTITY_ID,
     ATTR_CALIBRATION_TYPE,
+    ATTR_SAMPLES,
+    ATTR_MAX_DEVIATION,
+    ATTR_START,
+    ATTR_END,
+    ATTR_FORMAT,
+    ATTR_SOURCE,
+    ATTR_FILENAME,
+    ATTR_DURATION,
+    ATTR_MEMORY,
     ATTR_TANK_HEIGHT,
     ATTR_TANK_DIAMETER,
     ATTR_TANK_VOLUME,
@@ -30,7 +49,17 @@ from .const import (
     ATTR_ALERTS_ENABLED,
     CALIBRATION_EMPTY,
     CALIBRATION_FULL,
+    DEFAULT_CALIBRATION_SAMPLES,
+    DEFAULT_CALIBRATION_MAX_DEVIATION,
+    EXPORT_DIRECTORY,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_PARQUET,
+    EXPORT_SOURCE_STATES,
+    EXPORT_SOURCE_STATISTICS,
 )
+from .export import EXPORT_ENTITIES, export_history
+from .profiler import ProfileSession
+from .trace import TraceSession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,6 +68,12 @@ CALIBRATE_SCHEMA = vol.Schema(
     {
         vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
         vol.Required(ATTR_CALIBRATION_TYPE): vol.In([CALIBRATION_EMPTY, CALIBRATION_FULL]),
+        vol.Optional(ATTR_SAMPLES, default=DEFAULT_CALIBRATION_SAMPLES): vol.All(
+            vol.Coerce(int), vol.Range(min=3, max=100)
+        ),
+        vol.Optional(ATTR_MAX_DEVIATION, default=DEFAULT_CALIBRATION_MAX_DEVIATION): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=50)
+        ),
     }
 )
 
@@ -60,6 +95,89 @@ UPDATE_SETTINGS_SCHEMA = vol.Schema(
     }
 )
 
+def async_resolve_targets(hass: HomeAssistant, entity_ids: list) -> list:
+    """Map AquaLevel entity ids to unique (coordinator, tank_id) pairs."""
+    entity_registry = er.async_get(hass)
+    device_registry = dr.async_get(hass)
+    targets = []
+    
+    for entity_id in entity_ids:
+        entity_entry = entity_registry.async_get(entity_id)
+        if not entity_entry or not entity_entry.device_id:
+            continue
+        coordinator = hass.data[DOMAIN].get(entity_entry.config_entry_id)
+        device = device_registry.async_get(entity_entry.device_id)
+        if not coordinator or not device:
+            continue
+        for tank_id in coordinator.tanks:
+            identifier = (DOMAIN, coordinator.device_identifier(tank_id))
+            if identifier in device.identifiers and (coordinator, tank_id) not in targets:
+                targets.append((coordinator, tank_id))
+    
+    return targets
+
+
+def async_resolve_coordinators(hass: HomeAssistant, entity_ids: list | None) -> list:
+    """Return the coordinators of the targeted devices, or all of them without a target."""
+    if not entity_ids:
+        return list(hass.data[DOMAIN].values())
+    coordinators = []
+    for coordinator, _tank_id in async_resolve_targets(hass, entity_ids):
+        if coordinator not in coordinators:
+            coordinators.append(coordinator)
+    return coordinators
+
+# Schema for the export_history service
+EXPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_FORMAT, default=EXPORT_FORMAT_CSV): vol.In(
+            [EXPORT_FORMAT_CSV, EXPORT_FORMAT_PARQUET]
+        ),
+        vol.Optional(ATTR_SOURCE, default=EXPORT_SOURCE_STATES): vol.In(
+            [EXPORT_SOURCE_STATES, EXPORT_SOURCE_STATISTICS]
+        ),
+        vol.Optional(ATTR_FILENAME): cv.string,
+    }
+)
+
+# Schema for the profile service
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_DURATION, default=60): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=3600)
+        ),
+        vol.Optional(ATTR_MEMORY, default=False): cv.boolean,
+    }
+)
+
+# Schema for the record_trace service
+RECORD_TRACE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_DURATION, default=3600): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=86400)
+        ),
+    }
+)
+
+def async_export_entities(hass: HomeAssistant, targets: list) -> dict:
+    """Map (coordinator, tank_id) targets to their history entities and tank names."""
+    entity_registry = er.async_get(hass)
+    entities = {}
+    
+    for coordinator, tank_id in targets:
+        for platform, suffix in EXPORT_ENTITIES:
+            unique_id = f"{coordinator.device_identifier(tank_id)}_{suffix}"
+            entity_id = entity_registry.async_get_entity_id(platform, DOMAIN, unique_id)
+            if entity_id:
+                entities[entity_id] = coordinator.tank_name(tank_id)
+    
+    return entities
+
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up services for the AquaLevel integration."""
     
@@ -71,18 +189,29 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         if not entity_ids:
             return
             
-        # Find valid coordinators from entities
-        coordinators = []
-        for entry_id, coordinator in hass.data[DOMAIN].items():
-            coordinators.append(coordinator)
+        targets = async_resolve_targets(hass, entity_ids)
         
-        if not coordinators:
+        if not targets:
             _LOGGER.warning("No AquaLevel device found for service call")
             return
             
-        # Apply calibration to all coordinators
-        for coordinator in coordinators:
-            await coordinator.async_calibrate(calibration_type)
+        # Calibrate all targeted tanks concurrently
+        results = await asyncio.gather(
+            *(
+                coordinator.async_calibrate(
+                    calibration_type,
+                    tank_id,
+                    samples=service_call.data[ATTR_SAMPLES],
+                    max_deviation=service_call.data[ATTR_MAX_DEVIATION],
+                )
+                for coordinator, tank_id in targets
+            ),
+            return_exceptions=True,
+        )
+        
+        errors = [str(result) for result in results if isinstance(result, Exception)]
+        if errors:
+            raise HomeAssistantError("; ".join(errors))
     
     async def async_update_settings_service(service_call: ServiceCall) -> None:
         """Handle update settings service calls."""
@@ -91,12 +220,9 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         if not entity_ids:
             return
             
-        # Find valid coordinators from entities
-        coordinators = []
-        for entry_id, coordinator in hass.data[DOMAIN].items():
-            coordinators.append(coordinator)
+        targets = async_resolve_targets(hass, entity_ids)
         
-        if not coordinators:
+        if not targets:
             _LOGGER.warning("No AquaLevel device found for service call")
             return
             
@@ -126,9 +252,78 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         if ATTR_ALERTS_ENABLED in service_call.data:
             settings["alerts_enabled"] = service_call.data[ATTR_ALERTS_ENABLED]
             
-        # Apply settings to all coordinators
-        for coordinator in coordinators:
-            await coordinator.async_update_settings(**settings)
+        # Apply settings to all targeted tanks
+        for coordinator, tank_id in targets:
+            await coordinator.async_update_settings(tank_id, **settings)
+    
+    async def async_export_history_service(service_call: ServiceCall) -> ServiceResponse:
+        """Handle export history service calls."""
+        entity_ids = service_call.data.get(ATTR_ENTITY_ID)
+        
+        # Without a target, export every tank of the fleet
+        if entity_ids:
+            targets = async_resolve_targets(hass, entity_ids)
+        else:
+            targets = [
+                (coordinator, tank_id)
+                for coordinator in hass.data[DOMAIN].values()
+                for tank_id in coordinator.tanks
+            ]
+        
+        if "recorder" not in hass.config.components:
+            raise HomeAssistantError("History export requires the recorder integration")
+        
+        entities = async_export_entities(hass, targets)
+        if not entities:
+            raise HomeAssistantError("No AquaLevel history entities found to export")
+        
+        start = dt_util.as_utc(service_call.data[ATTR_START])
+        end = dt_util.as_utc(service_call.data.get(ATTR_END) or dt_util.utcnow())
+        if end <= start:
+            raise HomeAssistantError("End of the export range must be after its start")
+        
+        export_format = service_call.data[ATTR_FORMAT]
+        filename = os.path.basename(
+            service_call.data.get(ATTR_FILENAME)
+            or f"aqualevel_{start:%Y%m%d}_{end:%Y%m%d}.{export_format}"
+        )
+        path = hass.config.path(EXPORT_DIRECTORY, filename)
+        
+        rows = await get_instance(hass).async_add_executor_job(
+            export_history,
+            hass,
+            path,
+            entities,
+            start,
+            end,
+            service_call.data[ATTR_SOURCE],
+            export_format,
+        )
+        
+        return {"path": path, "rows": rows, "entities": list(entities)}
+    
+    async def async_profile_service(service_call: ServiceCall) -> None:
+        """Handle profile service calls."""
+        coordinators = async_resolve_coordinators(hass, service_call.data.get(ATTR_ENTITY_ID))
+        if not coordinators:
+            raise HomeAssistantError("No AquaLevel device found to profile")
+            
+        session = ProfileSession(
+            hass,
+            coordinators,
+            service_call.data[ATTR_DURATION],
+            service_call.data[ATTR_MEMORY],
+        )
+        await session.async_start()
+    
+    async def async_record_trace_service(service_call: ServiceCall) -> None:
+        """Handle record trace service calls."""
+        coordinators = async_resolve_coordinators(hass, service_call.data.get(ATTR_ENTITY_ID))
+        if not coordinators:
+            raise HomeAssistantError("No AquaLevel device found to record")
+        
+        session = TraceSession(hass, coordinators, service_call.data[ATTR_DURATION])
+        session.async_start()
     
     # Register our services with Home Assistant
     hass.services.async_register(
@@ -144,6 +339,28 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         async_update_settings_service,
         schema=UPDATE_SETTINGS_SCHEMA,
     )
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        async_export_history_service,
+        schema=EXPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile_service,
+        schema=PROFILE_SCHEMA,
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD_TRACE,
+        async_record_trace_service,
+        schema=RECORD_TRACE_SCHEMA,
+    )
 
 async def async_unload_services(hass: HomeAssistant) -> None:
     """Unload AquaLevel services."""
@@ -152,3 +369,12 @@ async def async_unload_services(hass: HomeAssistant) -> None:
         
     if hass.services.has_service(DOMAIN, SERVICE_UPDATE_SETTINGS):
         hass.services.async_remove(DOMAIN, SERVICE_UPDATE_SETTINGS)
+        
+    if hass.services.has_service(DOMAIN, SERVICE_EXPORT_HISTORY):
+        hass.services.async_remove(DOMAIN, SERVICE_EXPORT_HISTORY)
+        
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        hass.services.async_remove(DOMAIN, SERVICE_PROFILE)
+        
+    if hass.services.has_service(DOMAIN, SERVICE_RECORD_TRACE):
+        hass.services.async_remove(DOMAIN, SERVICE_RECORD_TRACE)
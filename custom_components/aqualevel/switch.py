@@ -1,85 +1,93 @@
 """AquaLevel switch platform."""
 import logging
 import asyncio
+from dataclasses import dataclass
 
-from homeassistant.components.switch import SwitchEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.entity import DeviceInfo
 
 from .const import DOMAIN
+from .entity import AquaLevelEntity, async_add_tank_entities
 
 _LOGGER = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True, kw_only=True)
+class AquaLevelSwitchEntityDescription(SwitchEntityDescription):
+    """Describes an AquaLevel settings switch."""
+
+    value_key: str
+    service_param: str
+
+
+SWITCH_DESCRIPTIONS = (
+    AquaLevelSwitchEntityDescription(
+        key="alerts_enabled",
+        value_key="alertsEnabled",
+        service_param="alerts_enabled",
+        name="Alerts Enabled",
+        icon="mdi:bell-ring-outline",
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ):
     """Set up AquaLevel switch entities from a config entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
     
-    entities = [
-        AquaLevelAlertsEnabledSwitch(coordinator),
-    ]
-    
-    async_add_entities(entities)
-
-
-class AquaLevelAlertsEnabledSwitch(CoordinatorEntity, SwitchEntity):
-    """Switch for enabling/disabling alerts."""
-
-    _attr_has_entity_name = True
-
-    def __init__(self, coordinator):
-        """Initialize the switch entity."""
-        super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.host}_alerts_enabled"
-        self._attr_name = "Alerts Enabled"
-        self._attr_icon = "mdi:bell-ring-outline"
-            
-        # Device info for device registry
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.host)},
-            name=coordinator.name,
-            manufacturer="TechPosts Media",
-            model="AquaLevel Water Tank Monitor",
-            sw_version="1.0",
-        )
+    async_add_tank_entities(
+        entry, coordinator, SWITCH_DESCRIPTIONS, AquaLevelSettingSwitch, async_add_entities
+    )
+
+
+class AquaLevelSettingSwitch(AquaLevelEntity, SwitchEntity):
+    """Switch for a boolean tank setting such as alerts enabled."""
+
+    entity_description: AquaLevelSwitchEntityDescription
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return (self.coordinator.data is not None and 
-                "alertsEnabled" in self.coordinator.data)
+        return (super().available and
+                self.entity_description.value_key in self.tank_data)
 
     @property
     def is_on(self) -> bool:
         """Return true if switch is on."""
-        if not self.coordinator.data:
+        if not self.tank_data:
             return False
-        return bool(self.coordinator.data.get("alertsEnabled", True))
+        return bool(self.tank_data.get(self.entity_description.value_key, True))
 
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
-        _LOGGER.debug("Turning on alerts")
-        await self.coordinator.async_update_settings(alerts_enabled=True)
+        _LOGGER.debug("Turning on %s", self.entity_description.service_param)
+        await self.coordinator.async_update_settings(
+            self._tank_id, **{self.entity_description.service_param: True}
+        )
         
         # Optimistically update state
         self.async_write_ha_state()
         
         # Force a state refresh
         await asyncio.sleep(2)
+        self.coordinator.async_skip_long_poll()
         await self.coordinator.async_refresh()
 
     async def async_turn_off(self, **kwargs):
         """Turn the switch off."""
-        _LOGGER.debug("Turning off alerts")
-        await self.coordinator.async_update_settings(alerts_enabled=False)
+        _LOGGER.debug("Turning off %s", self.entity_description.service_param)
+        await self.coordinator.async_update_settings(
+            self._tank_id, **{self.entity_description.service_param: False}
+        )
         
         # Optimistically update state
         self.async_write_ha_state()
         
         # Force a state refresh
         await asyncio.sleep(2)
+        self.coordinator.async_skip_long_poll()
         await self.coordinator.async_refresh()
@@ -0,0 +1,143 @@
+"""Recording of AquaLevel device traffic into compact trace files.
+
+A trace is a gzipped JSON lines file. The first line is a header with the
+device host, name and entry options. Every further line is one exchange:
+
+    [offset, "tank-data", payload]   a report; payload is null for 204/304
+    [offset, "settings", data]       a settings write, as sent to the device
+
+``offset`` is the number of seconds since recording started. Payloads are
+stored as the coordinator received them, so deltas stay deltas.
+"""
+import gzip
+import json
+import logging
+import os
+import time
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_TRACE,
+    EVENT_TRACE_COMPLETE,
+    TOPIC_SETTINGS,
+    TOPIC_TANK_DATA,
+    TRACE_DIRECTORY,
+    TRACE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def write_trace(path: str, header: dict, events: list) -> None:
+    """Write a trace file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        for line in (header, *events):
+            file.write(json.dumps(line, separators=(",", ":")))
+            file.write("\n")
+
+
+def read_trace(path: str) -> tuple:
+    """Read a trace file and return its header and events."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header = json.loads(file.readline())
+        if header.get("version") != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version in {path}: {header.get('version')}")
+        events = [json.loads(line) for line in file if line.strip()]
+    return header, events
+
+
+class TraceRecorder:
+    """Collect the exchanges of one coordinator while attached to it.
+
+    The coordinator never modifies a payload after processing it, so the
+    recorder keeps references and serializes them only when writing.
+    """
+
+    def __init__(self, coordinator):
+        """Initialize the recorder."""
+        self.header = {
+            "version": TRACE_VERSION,
+            "host": coordinator.host,
+            "name": coordinator.name,
+            "options": coordinator.options,
+            "started": dt_util.utcnow().isoformat(),
+        }
+        self.events = []
+        self._started = time.monotonic()
+
+    def _offset(self) -> float:
+        """Return the seconds since recording started."""
+        return round(time.monotonic() - self._started, 3)
+
+    @callback
+    def async_record_report(self, payload: dict | None) -> None:
+        """Record a /tank-data report, or None if nothing changed."""
+        self.events.append([self._offset(), TOPIC_TANK_DATA, payload])
+
+    @callback
+    def async_record_settings(self, data: dict) -> None:
+        """Record a settings write."""
+        self.events.append([self._offset(), TOPIC_SETTINGS, data])
+
+
+class TraceSession:
+    """A time-limited recording of the traffic of some coordinators."""
+
+    def __init__(self, hass: HomeAssistant, coordinators: list, duration: int):
+        """Initialize the session."""
+        self.hass = hass
+        self.coordinators = coordinators
+        self.duration = duration
+        self._recorders = {}
+        self._cancel_stop = None
+        self._name = f"{dt_util.now():%Y%m%d_%H%M%S}"
+
+    @callback
+    def async_start(self) -> None:
+        """Attach recorders and schedule the session to end by itself."""
+        if self.hass.data.get(DATA_TRACE) is not None:
+            raise HomeAssistantError("An AquaLevel trace is already being recorded")
+
+        for coordinator in self.coordinators:
+            coordinator.trace = self._recorders[coordinator] = TraceRecorder(coordinator)
+        self.hass.data[DATA_TRACE] = self
+        self._cancel_stop = async_call_later(
+            self.hass, timedelta(seconds=self.duration), self._async_stop_later
+        )
+        _LOGGER.info(
+            "Recording traffic of %s AquaLevel device(s) for %s s",
+            len(self.coordinators), self.duration,
+        )
+
+    async def _async_stop_later(self, _now) -> None:
+        """Finish the session when its duration elapses."""
+        self._cancel_stop = None
+        await self.async_stop()
+
+    async def async_stop(self) -> None:
+        """Detach the recorders and write one trace per device."""
+        if self._cancel_stop is not None:
+            self._cancel_stop()
+            self._cancel_stop = None
+        self.hass.data.pop(DATA_TRACE, None)
+
+        traces = []
+        for coordinator, recorder in self._recorders.items():
+            if coordinator.trace is recorder:
+                coordinator.trace = None
+            name = f"{coordinator.host}_{self._name}".replace("/", "_").replace(":", "_")
+            path = self.hass.config.path(TRACE_DIRECTORY, f"{name}.jsonl.gz")
+            traces.append((path, recorder.header, recorder.events))
+
+        files = []
+        for path, header, events in traces:
+            await self.hass.async_add_executor_job(write_trace, path, header, events)
+            files.append(path)
+        _LOGGER.info("AquaLevel traces written to %s", ", ".join(files))
+        self.hass.bus.async_fire(EVENT_TRACE_COMPLETE, {"files": files})
@@ -0,0 +1,41 @@
+"""Tests for the AquaLevel payload helpers."""
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.aqualevel.coordinator import join_tanks, merge_delta, split_tanks
+
+
+def test_controller_delta_on_multi_tank_snapshot():
+    """A delta without tanks updates the controller, not a phantom tank."""
+    payload = {
+        "seq": 1,
+        "rssi": -60,
+        "tanks": [{"id": "a", "percentage": 40}, {"id": "b", "percentage": 70}],
+    }
+    tanks = split_tanks(payload)
+
+    payload, merged, changed = merge_delta(
+        payload, tanks, {"seq": 2, "delta": True, "rssi": -61}
+    )
+
+    assert set(merged) == {"a", "b"}
+    assert merged["a"] is tanks["a"]
+    assert changed == set()
+    assert join_tanks(payload, merged) == {
+        "seq": 1,
+        "rssi": -61,
+        "tanks": [{"id": "a", "percentage": 40}, {"id": "b", "percentage": 70}],
+    }
+
+
+def test_delta_on_single_tank_snapshot():
+    """On a single-tank controller, top-level fields are the tank's readings."""
+    payload = {"seq": 1, "percentage": 40, "rssi": -60}
+
+    payload, merged, changed = merge_delta(
+        payload, split_tanks(payload), {"seq": 2, "delta": True, "percentage": 39}
+    )
+
+    assert changed == {""}
+    assert join_tanks(payload, merged) == {"seq": 1, "percentage": 39, "rssi": -60}